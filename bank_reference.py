@@ -0,0 +1,344 @@
+"""Pencocokan nama pelapor SLIK ke tabel kode bank (ZZ Data Kode Bank.xlsx).
+
+Modul ini tidak mengimpor streamlit supaya bisa dipakai di luar aplikasi.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from collections import deque
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+# Lokasi bawaan tabel kode bank (relatif terhadap direktori kerja aplikasi)
+KODEBANK_PATH = "ZZ Data Kode Bank.xlsx"
+
+# Atribut BankIndex yang disimpan di sidecar; semuanya data biasa (list, dict, set, str, angka)
+INDEX_ATTRIBUTES = ("keterangan", "fuzzy_threshold", "nama_bank", "_goto", "_fail", "_best",
+                    "_ngrams", "_lengths", "_by_code")
+
+# Batas jumlah hasil pencocokan perkiraan yang disimpan per BankIndex
+FUZZY_CACHE_MAX = 10000
+
+# Kolom hasil BankIndex.resolve, sesuai urutan kolom yang ditambahkan ke data gabungan
+RESOLVED_COLUMNS = ["BANK", "CABANG", "KODE BANK", "NAMA BANK"]
+
+# Panjang n-gram karakter untuk pencocokan perkiraan
+NGRAM_SIZE = 3
+
+# Skor minimum pencocokan perkiraan (koefisien Dice n-gram, lihat BankIndex.find_fuzzy)
+DEFAULT_FUZZY_THRESHOLD = 0.85
+
+# Kode pelapor di awal KETERANGAN / teks pelapor: "<kode> - <nama>"
+_CODE_PREFIX = re.compile(r"\s*(\d+)\s+-\s")
+
+
+class BankIndex:
+    """Index multi-pattern (Aho-Corasick) atas kolom KETERANGAN tabel kode bank.
+
+    Seperti loop lama di combine_and_clean_data, KETERANGAN yang dipakai
+    adalah yang paling atas di tabel di antara semua KETERANGAN yang muncul
+    di teks pelapor. Bedanya, teks pelapor cukup dibaca satu kali, bukan
+    sekali per baris tabel.
+
+    Teks pelapor yang tidak memuat KETERANGAN mana pun (spasi berlebih, nama
+    terpotong, cabang berganti nama) dicocokkan secara perkiraan lewat n-gram,
+    hanya dengan KETERANGAN yang kode pelapornya sama dan jika skornya minimal
+    fuzzy_threshold (None = tanpa pencocokan perkiraan). Hasilnya disimpan per
+    teks supaya tidak dihitung ulang.
+
+    Pencocokan perkiraan tidak memakai index n-gram (posting list): kandidat
+    diambil dari kelompok per kode pelapor lalu dibandingkan satu per satu.
+    Kelompok itu rata-rata hanya berisi satu KETERANGAN (paling banyak empat
+    di tabel saat ini), jadi posting list justru lebih lambat.
+    """
+
+    def __init__(self, kodebank, fuzzy_threshold=DEFAULT_FUZZY_THRESHOLD):
+        self.keterangan = [k for k in kodebank["KETERANGAN"] if isinstance(k, str)]
+        self.fuzzy_threshold = fuzzy_threshold
+        self._fuzzy_cache = {}
+        # Sama dengan dict(zip(...)) lama: KETERANGAN ganda memakai baris terakhir
+        if "NAMA BANK" in kodebank.columns:
+            self.nama_bank = dict(zip(kodebank["KETERANGAN"], kodebank["NAMA BANK"]))
+        else:
+            self.nama_bank = None
+        self._build()
+        self._build_ngrams()
+
+    def to_data(self):
+        """Isi index sebagai data biasa untuk sidecar, tanpa objek BankIndex"""
+        return {name: getattr(self, name) for name in INDEX_ATTRIBUTES}
+
+    @classmethod
+    def from_data(cls, data):
+        """BankIndex dari hasil to_data, tanpa membangun ulang automaton dan n-gram"""
+        index = cls.__new__(cls)
+        for name in INDEX_ATTRIBUTES:
+            setattr(index, name, data[name])
+        index._fuzzy_cache = {}
+        return index
+
+    def _build(self):
+        # goto[node]: dict karakter -> node; best[node]: index KETERANGAN terkecil
+        # yang berakhir di node ini atau di salah satu suffix-nya (lewat fail link)
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+        for i, pattern in enumerate(self.keterangan):
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                node = nxt
+            if self._best[node] is None:
+                self._best[node] = i
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._best[child] = _min_index(self._best[child], self._best[self._fail[child]])
+                queue.append(child)
+
+    def _build_ngrams(self):
+        # n-gram dan panjang (setelah normalisasi) setiap KETERANGAN, serta kelompok per kode pelapor:
+        # kandidat pencocokan perkiraan hanya KETERANGAN dengan kode yang sama (tanpa posting list)
+        self._ngrams = []
+        self._lengths = []
+        self._by_code = {}
+        for i, pattern in enumerate(self.keterangan):
+            normalized = _normalize(pattern)
+            self._ngrams.append(_ngrams(normalized))
+            self._lengths.append(len(normalized))
+            code = _code(pattern)
+            if code is not None:
+                self._by_code.setdefault(code, []).append(i)
+
+    def find(self, text):
+        """Index KETERANGAN teratas yang muncul di text, None jika tidak ada"""
+        goto, fail, best_of = self._goto, self._fail, self._best
+        best = best_of[0]
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            best = _min_index(best, best_of[node])
+        return best
+
+    def find_fuzzy(self, text):
+        """(index KETERANGAN, skor) terbaik dengan kode pelapor yang sama, None di bawah ambang.
+
+        Kandidat hanya KETERANGAN yang kodenya (angka sebelum " - ") sama dengan
+        kode di awal teks pelapor; teks tanpa kode tidak dicocokkan. Skor adalah
+        koefisien Dice antara n-gram KETERANGAN dan n-gram awal teks sepanjang
+        KETERANGAN, jadi bagian KETERANGAN yang hilang maupun teks lain yang
+        menyisip di nama sama-sama menurunkan skor. Skor sama dimenangkan
+        KETERANGAN dengan n-gram lebih banyak (lebih spesifik), lalu yang paling
+        atas di tabel.
+        """
+        candidates = self._by_code.get(_code(text), ())
+        if not candidates:
+            return None
+
+        normalized = _normalize(text)
+        best = None
+        for i in candidates:
+            grams = self._ngrams[i]
+            window = _ngrams(normalized[:self._lengths[i]])
+            total = len(grams) + len(window)
+            score = 2 * len(grams & window) / total if total else 0.0
+            key = (score, len(grams), -i)
+            if best is None or key > best:
+                best = key
+        score, _, i = best
+        if score < self.fuzzy_threshold:
+            return None
+        return -i, score
+
+    def _match_fuzzy(self, text):
+        if text in self._fuzzy_cache:
+            return self._fuzzy_cache[text]
+
+        result = None
+        found = self.find_fuzzy(text)
+        if found is not None:
+            keterangan = self.keterangan[found[0]]
+            result = keterangan, _remainder(keterangan, text)
+        if len(self._fuzzy_cache) >= FUZZY_CACHE_MAX:
+            self._fuzzy_cache.clear()
+        self._fuzzy_cache[text] = result
+        return result
+
+    def match(self, text):
+        """KETERANGAN dan sisa teks (CABANG) untuk satu teks pelapor"""
+        i = self.find(text)
+        if i is not None:
+            keterangan = self.keterangan[i]
+            return keterangan, text.replace(keterangan, "").strip()
+
+        if self.fuzzy_threshold is not None:
+            result = self._match_fuzzy(text)
+            if result is not None:
+                return result
+        return text, ""
+
+    def resolve(self, banks):
+        """Menghitung BANK, CABANG, KODE BANK dan NAMA BANK untuk seluruh kolom BANK.
+
+        Hanya nilai unik yang dicocokkan, lalu hasilnya disebar ke semua baris.
+        BANK berisi NAMA BANK dari tabel (NaN jika tidak ada di tabel), KODE BANK
+        dan NAMA BANK berasal dari KETERANGAN yang dipisah pada " - ".
+        """
+        codes, uniques = pd.factorize(pd.Series(banks), use_na_sentinel=True)
+        rows = []
+        for text in uniques:
+            keterangan, cabang = self.match(text)
+            kode, pemisah, nama = keterangan.partition(" - ")
+            bank = keterangan if self.nama_bank is None else self.nama_bank.get(keterangan, np.nan)
+            rows.append((bank, cabang, kode, nama if pemisah else None))
+        # Baris terakhir untuk BANK kosong
+        rows.append((np.nan, "", np.nan, np.nan))
+
+        resolved = pd.DataFrame(rows, columns=RESOLVED_COLUMNS)
+        resolved = resolved.iloc[np.where(codes < 0, len(uniques), codes)]
+        resolved.index = banks.index
+        return resolved
+
+
+def sidecar_path(path):
+    return path + ".pkl"
+
+
+def file_signature(path):
+    """(ukuran, mtime) file; dipakai sebagai kunci cache yang murah dihitung"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_sha256():
+    """sha256 modul ini: sidecar yang dibangun kode versi lain tidak dipakai"""
+    return _file_sha256(__file__)
+
+
+def _read_sidecar(path):
+    try:
+        with open(sidecar_path(path), "rb") as f:
+            sidecar = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(sidecar, dict) or sidecar.get("code") != _code_sha256():
+        return None
+    return sidecar
+
+
+def _write_sidecar(path, sidecar):
+    # Ditulis atomik; direktori yang tidak bisa ditulisi cukup dilewati
+    target = sidecar_path(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(sidecar, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, target)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_bank_index(path=KODEBANK_PATH):
+    """Memuat BankIndex dari sidecar pickle, atau dari Excel jika sidecar basi.
+
+    Sidecar <path>.pkl berisi data BankIndex (KETERANGAN, automaton dan
+    n-gram yang sudah dibangun) sebagai data biasa, bukan objek BankIndex, dan
+    hanya berlaku untuk kode bank_reference.py yang sama persis. Sidecar dipakai
+    langsung jika ukuran & mtime Excel sama; jika berbeda, sha256 isi Excel
+    dibandingkan dulu sebelum Excel dibaca ulang.
+    """
+    signature = file_signature(path)
+    sidecar = _read_sidecar(path)
+    if sidecar is not None:
+        if sidecar["signature"] == signature:
+            return BankIndex.from_data(sidecar["index"])
+        sha256 = _file_sha256(path)
+        if sidecar["sha256"] == sha256:
+            sidecar["signature"] = signature
+            _write_sidecar(path, sidecar)
+            return BankIndex.from_data(sidecar["index"])
+    else:
+        sha256 = _file_sha256(path)
+
+    index = BankIndex(pd.read_excel(path))
+    _write_sidecar(path, {"code": _code_sha256(), "signature": signature, "sha256": sha256,
+                          "index": index.to_data()})
+    return index
+
+
+def _code(text):
+    """Kode pelapor (int) di depan " - ", None jika tidak ada"""
+    match = _CODE_PREFIX.match(text)
+    return int(match.group(1)) if match else None
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _remainder(keterangan, text):
+    """Teks pelapor di luar bagian yang sejajar dengan KETERANGAN (calon CABANG)"""
+    text = " ".join(text.split())
+    matcher = SequenceMatcher(None, _normalize(keterangan), text.lower(), autojunk=False)
+    blocks = [block for block in matcher.get_matching_blocks() if block.size >= NGRAM_SIZE]
+    if not blocks:
+        return text
+    start, end = blocks[0].b, blocks[-1].b + blocks[-1].size
+    # Digeser ke batas kata terdekat supaya CABANG tidak berisi potongan kata
+    start, end = _word_boundary(text, start), _word_boundary(text, end)
+    return (text[:start] + " " + text[end:]).strip()
+
+
+def _word_boundary(text, pos):
+    """Batas kata terdekat dari pos (ke kiri jika jaraknya sama)"""
+    if pos <= 0 or pos >= len(text) or text[pos - 1] == " " or text[pos] == " ":
+        return pos
+    left = text.rfind(" ", 0, pos) + 1
+    right = text.find(" ", pos)
+    if right < 0:
+        right = len(text)
+    return left if pos - left <= right - pos else right
+
+
+def _min_index(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
@@ -0,0 +1,238 @@
+"""Konversi batch laporan PDF SLIK tanpa UI Streamlit (mis. dijalankan cron).
+
+Pipeline-nya sama dengan tombol Mulai Konversi di aplikasi: ekstraksi teks PDF,
+parsing semua jenis fasilitas, gabung & cleaning (modul pipeline), lalu ekspor.
+Progres dikirim ke logging, bukan ke widget Streamlit, dan streamlit tidak ikut
+diimpor.
+
+Contoh:
+    python -m batch_convert laporan/ hasil.xlsx
+    python -m batch_convert "laporan/2024-*.pdf" hasil.parquet --workers 8
+    python -m batch_convert laporan/ per_debitur.zip --no-cache -v
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from cleaning import DEFAULT_STRING_STORAGE, STRING_STORAGES
+from export import (
+    DOWNLOAD_FORMATS,
+    partitioned_excel_zip,
+    save_to_excel_formatted,
+    write_columnar,
+    write_csv_gz,
+)
+from extraction import (
+    DEFAULT_BACKEND,
+    DEFAULT_WORKERS,
+    EXTRACTION_BACKENDS,
+    PageTextCache,
+    convert_pdfs_to_json,
+    extract_pdfs,
+)
+from polars_engine import COMBINE_ENGINES, DEFAULT_COMBINE_ENGINE
+from pipeline import build_combined_data, combine_and_clean_data, process_all_facility_data
+from pipeline import logger as pipeline_logger
+from text_archive import append_report, file_sha256
+
+logger = logging.getLogger("batch_convert")
+
+# Format output dan ekstensinya; "zip" = satu workbook Excel per debitur
+OUTPUT_FORMATS = {
+    "xlsx": ".xlsx",
+    **{fmt: extension for fmt, (extension, _) in DOWNLOAD_FORMATS.items()},
+    "zip": ".zip",
+}
+DEFAULT_OUTPUT_FORMAT = "xlsx"
+
+
+def find_pdfs(inputs, recursive=False):
+    """File PDF dari daftar file, direktori atau pola glob; urut dan tanpa duplikat"""
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*") if recursive else os.path.join(item, "*")
+            paths = glob.glob(pattern, recursive=recursive)
+        elif glob.has_magic(item):
+            paths = glob.glob(item, recursive=recursive)
+        else:
+            paths = [item]
+        found.extend(
+            path for path in sorted(paths)
+            if path.lower().endswith(".pdf") and os.path.isfile(path)
+        )
+    return list(dict.fromkeys(os.path.abspath(path) for path in found))
+
+
+def output_format(output, fmt=None):
+    """Format output: fmt jika diisi, selain itu dari ekstensi output (bawaan xlsx)"""
+    if fmt:
+        return fmt
+    name = output.lower()
+    # Ekstensi terpanjang dulu supaya .csv.gz tidak terbaca sebagai format lain
+    for candidate, extension in sorted(OUTPUT_FORMATS.items(), key=lambda item: -len(item[1])):
+        if name.endswith(extension):
+            return candidate
+    return DEFAULT_OUTPUT_FORMAT
+
+
+def write_output(df, output, fmt, max_workers=1):
+    """Menulis data final ke output secara atomik: file lama baru diganti setelah selesai ditulis"""
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "xlsx":
+            save_to_excel_formatted(df, tmp_path)
+        elif fmt == "csv.gz":
+            write_csv_gz(df, tmp_path)
+        elif fmt == "zip":
+            def zip_progress(selesai, total, nama_file):
+                logger.debug("Selesai %s (%d/%d)", nama_file, selesai, total)
+
+            partitioned_excel_zip(df, tmp_path, max_workers=max_workers, progress_callback=zip_progress)
+        else:
+            write_columnar(df, tmp_path, fmt)
+        # mkstemp membuat file 0600; output mengikuti umask seperti file biasa
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, output)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def convert(pdf_paths, output, fmt=DEFAULT_OUTPUT_FORMAT, max_workers=DEFAULT_WORKERS, backend=DEFAULT_BACKEND,
+            cache=None, drop_overlay=True, compact=True, string_storage=DEFAULT_STRING_STORAGE,
+            engine=DEFAULT_COMBINE_ENGINE, json_dir=None, archive_path=None):
+    """Menjalankan pipeline lengkap untuk pdf_paths dan menulis hasilnya ke output.
+
+    Mengembalikan DataFrame final, atau None jika tidak ada teks yang bisa diambil.
+    """
+    mulai = time.perf_counter()
+
+    def extract_progress(selesai, total, pdf_path):
+        logger.info("Selesai %s (%d/%d)", os.path.basename(pdf_path), selesai, total)
+
+    logger.info("Memproses %d file dengan %d worker (backend %s)", len(pdf_paths), max_workers, backend)
+    options = dict(max_workers=max_workers, progress_callback=extract_progress, backend=backend,
+                   cache=cache, drop_overlay=drop_overlay)
+    if json_dir:
+        os.makedirs(json_dir, exist_ok=True)
+        jobs = [
+            (pdf_path, os.path.join(json_dir, os.path.splitext(os.path.basename(pdf_path))[0] + ".json"))
+            for pdf_path in pdf_paths
+        ]
+        text_lists = convert_pdfs_to_json(jobs, **options)
+    else:
+        text_lists = extract_pdfs(pdf_paths, **options)
+    if cache is not None and cache.hits:
+        logger.info("%d dari %d file diambil dari cache tanpa ekstraksi ulang", cache.hits, len(pdf_paths))
+
+    if archive_path:
+        halaman_arsip = sum(
+            append_report(archive_path, os.path.basename(pdf_path), text_data, file_sha256(pdf_path))
+            for pdf_path, text_data in zip(pdf_paths, text_lists)
+        )
+        logger.info("%d halaman baru diarsipkan", halaman_arsip)
+
+    combined_data = build_combined_data(text_lists, string_storage)
+    del text_lists
+    if combined_data is None:
+        return None
+    logger.info("Total data yang digabungkan: %d baris", len(combined_data))
+
+    frames = process_all_facility_data(combined_data)
+    del combined_data
+    logger.info(
+        "Kredit %d, LC %d, Garansi %d, Surat %d, Fasilitas %d baris",
+        *(len(frame) for frame in frames)
+    )
+
+    final_data = combine_and_clean_data(*frames, compact=compact, string_storage=string_storage, engine=engine)
+    del frames
+
+    logger.info("Menulis %s (%s)", output, fmt)
+    write_output(final_data, output, fmt, max_workers=max_workers)
+    logger.info(
+        "Selesai dalam %.1f detik: %d baris, %.2f MB",
+        time.perf_counter() - mulai, len(final_data), os.path.getsize(output) / 1024 / 1024
+    )
+    return final_data
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m batch_convert",
+        description="Konversi batch laporan PDF SLIK ke Excel/Parquet/Arrow/CSV tanpa UI Streamlit."
+    )
+    parser.add_argument("inputs", nargs="+", help="File PDF, direktori, atau pola glob (beri tanda kutip)")
+    parser.add_argument("output", help="File output; format diambil dari ekstensi jika --format tidak diisi")
+    parser.add_argument("-f", "--format", choices=list(OUTPUT_FORMATS),
+                        help="Format output (zip = satu file Excel per debitur). Bawaan: dari ekstensi output")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Cari PDF juga di subdirektori")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Jumlah worker ekstraksi PDF dan ekspor ZIP (bawaan {DEFAULT_WORKERS})")
+    parser.add_argument("--backend", choices=EXTRACTION_BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"Backend ekstraksi teks (bawaan {DEFAULT_BACKEND})")
+    parser.add_argument("--keep-watermark", action="store_true", help="Jangan buang karakter watermark/overlay")
+    parser.add_argument("--no-cache", action="store_true", help="Jangan pakai cache teks PDF")
+    parser.add_argument("--cache-dir", help="Direktori cache teks PDF (bawaan SLIK_CACHE_DIR atau direktori temp)")
+    parser.add_argument("--no-compact", action="store_true", help="Matikan mode hemat memori")
+    parser.add_argument("--string-storage", choices=STRING_STORAGES, default=DEFAULT_STRING_STORAGE,
+                        help=f"Penyimpanan kolom teks (bawaan {DEFAULT_STRING_STORAGE})")
+    parser.add_argument("--engine", choices=COMBINE_ENGINES, default=DEFAULT_COMBINE_ENGINE,
+                        help=f"Engine gabung & cleaning (bawaan {DEFAULT_COMBINE_ENGINE})")
+    parser.add_argument("--json-dir", help="Simpan juga teks setiap PDF sebagai JSON (debug) di direktori ini")
+    parser.add_argument("--archive", default=os.environ.get("SLIK_ARCHIVE_PATH"),
+                        help="Arsip audit teks hasil ekstraksi (bawaan SLIK_ARCHIVE_PATH)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Log DEBUG pipeline (progres per debitur, rincian memori per kolom)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Hanya log peringatan dan error")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    if args.verbose:
+        # Hanya logger pipeline; log DEBUG pdfminer/streamlit terlalu banyak
+        for name in (logger.name, pipeline_logger.name):
+            logging.getLogger(name).setLevel(logging.DEBUG)
+
+    pdf_paths = find_pdfs(args.inputs, recursive=args.recursive)
+    if not pdf_paths:
+        logger.error("Tidak ada file PDF ditemukan di %s", ", ".join(args.inputs))
+        return 1
+
+    final_data = convert(
+        pdf_paths,
+        args.output,
+        fmt=output_format(args.output, args.format),
+        max_workers=max(args.workers, 1),
+        backend=args.backend,
+        cache=None if args.no_cache else PageTextCache(args.cache_dir),
+        drop_overlay=not args.keep_watermark,
+        compact=not args.no_compact,
+        string_storage=args.string_storage,
+        engine=args.engine,
+        json_dir=args.json_dir,
+        archive_path=args.archive,
+    )
+    if final_data is None:
+        logger.error("Tidak ada teks yang bisa diambil dari file PDF")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
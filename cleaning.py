@@ -0,0 +1,329 @@
+"""Pembersihan kolom data gabungan SLIK (nominal, persentase, tanggal).
+
+Modul ini tidak mengimpor streamlit supaya bisa dipakai di luar aplikasi.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+def parse_amount(values, keep_decimal=False):
+    """Nominal format Indonesia ("Rp 1.234.567,89") satu kolom sekaligus menjadi angka.
+
+    Bawaan sama dengan pembersihan lama: bagian setelah koma dibuang, titik
+    ribuan dihapus, nilai yang tidak bisa dibaca menjadi 0. keep_decimal=True
+    mempertahankan bagian desimal (koma menjadi titik desimal).
+    """
+    text = values.astype(str).str.replace("Rp", "", regex=False)
+    if keep_decimal:
+        text = text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    else:
+        text = text.str.split(",", n=1).str[0].str.replace(".", "", regex=False)
+    return pd.to_numeric(text, errors="coerce").fillna(0)
+
+
+def parse_percentage(values, scale=1):
+    """Persentase ("10.50 %") satu kolom sekaligus menjadi angka dibagi scale.
+
+    Nilai kosong tetap kosong, nilai yang tidak bisa dibaca menjadi NaN. Kolom
+    yang sudah berupa angka bisa dilewatkan lagi, mis. scale=100 untuk pecahan.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values / scale
+    text = values.astype(str).str.replace("%", "", regex=False).str.strip()
+    parsed = pd.to_numeric(text, errors="coerce").astype(float)
+    return parsed.where(values.notna()) / scale
+
+
+# Mapping untuk typo bulan
+typo_mapping = {
+    'amgoursttiusas': 'Agustus',
+    'nmoovretimsabsier': 'November',
+    'jmuloi': 'Juli',
+    'smepotretimsabsier': 'September',
+    'omkotortbisears': 'Oktober',
+    'mmeoi': 'Mei',
+    'jmanourtaisrai': 'Januari',
+    'meborrutiasaris': 'Februari',
+    'amporilr': 'April',
+    'mmaorerttis': 'Maret',
+    'dmeosertmisabseir': 'Desember',
+    'jmunoi': 'Juni'
+}
+
+month_translation = {
+    'Januari': 'January',
+    'Februari': 'February',
+    'Maret': 'March',
+    'April': 'April',
+    'Mei': 'May',
+    'Juni': 'June',
+    'Juli': 'July',
+    'Agustus': 'August',
+    'September': 'September',
+    'Oktober': 'October',
+    'November': 'November',
+    'Desember': 'December'
+}
+
+def process_date_string(date_value):
+    # Handle missing values
+    if pd.isna(date_value) or str(date_value).strip() in ['', 'None', 'NaT']:
+        return None
+    
+    date_str = str(date_value).strip()
+    
+    try:
+        # 1. Coba parsing langsung dulu
+        parsed = pd.to_datetime(date_str, dayfirst=True, errors='coerce')
+        if not pd.isna(parsed):
+            return parsed
+        
+        # 2. Perbaiki typo bulan
+        for typo, correct in typo_mapping.items():
+            if typo in date_str.lower():
+                date_str = date_str.lower().replace(typo, correct.lower())
+                break
+        
+        # 3. Pisahkan komponen tanggal
+        parts = re.split(r'[\s/-]+', date_str)
+        if len(parts) != 3:
+            return None
+        
+        day, month, year = parts
+        
+        # 4. Bersihkan hari dan tahun
+        day = re.sub(r'[^\d]', '', day).zfill(2)
+        year = re.sub(r'[^\d]', '', year)
+        
+        # Handle tahun 2 digit
+        if len(year) == 2:
+            year = f'20{year}' if int(year) < 50 else f'19{year}'
+        
+        # 5. Terjemahkan bulan ke Inggris
+        month_corrected = month_translation.get(month.capitalize(), month)
+        
+        # 6. Gabungkan dan parse
+        formatted_date = f"{day} {month_corrected} {year}"
+        parsed = pd.to_datetime(formatted_date, format='%d %B %Y', errors='coerce')
+        
+        return parsed if not pd.isna(parsed) else None
+    
+    except Exception:
+        return None
+
+
+# Typo bulan dan nama bulan Indonesia -> nama bulan Inggris, dalam satu substitusi
+_MONTH_WORDS = {typo: month_translation[correct] for typo, correct in typo_mapping.items()}
+_MONTH_WORDS.update({indonesia.lower(): english for indonesia, english in month_translation.items()})
+MONTH_PATTERN = re.compile(
+    r"\b(?:" + "|".join(sorted(map(re.escape, _MONTH_WORDS), key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
+# Bentuk tanggal yang bisa langsung di-parse dengan DATE_FORMAT setelah substitusi bulan
+DATE_FORMAT = "%d %B %Y"
+DATE_PATTERN = r"\d{1,2} (?:" + "|".join(month_translation.values()) + r") \d{4}"
+
+
+def _translate_months(match):
+    return _MONTH_WORDS[match.group(0).lower()]
+
+
+def parse_unique_dates(values):
+    """Parse array nilai tanggal unik; hasilnya Series datetime (NaT jika gagal).
+
+    Nilai berbentuk "hari bulan tahun" di-parse sekaligus dengan DATE_FORMAT
+    setelah typo bulan diperbaiki dan nama bulan diterjemahkan lewat
+    MONTH_PATTERN. Hanya sisanya yang di-parse satu per satu dengan
+    process_date_string.
+    """
+    texts = pd.Series(values, dtype=object).astype(str).str.strip()
+    translated = texts.str.replace(MONTH_PATTERN, _translate_months, regex=True)
+    candidates = translated.where(translated.str.fullmatch(DATE_PATTERN, case=False))
+    parsed = pd.to_datetime(candidates, format=DATE_FORMAT, errors="coerce")
+
+    leftovers = parsed.isna().to_numpy()
+    if leftovers.any():
+        parsed[leftovers] = pd.to_datetime(
+            [process_date_string(value) for value in np.asarray(values, dtype=object)[leftovers]]
+        )
+    return parsed
+
+
+def normalize_dates(df, columns):
+    """Mengubah kolom-kolom tanggal menjadi datetime, setiap nilai unik cukup di-parse sekali.
+
+    Nilai semua kolom digabung sebelum dicari nilai uniknya, karena tanggal
+    yang sama sering muncul di beberapa kolom dan banyak baris.
+    """
+    columns = [col for col in columns if col in df.columns]
+    if not columns or df.empty:
+        return df
+
+    codes, uniques = pd.factorize(pd.concat([df[col] for col in columns], ignore_index=True))
+    lookup = np.append(parse_unique_dates(uniques).to_numpy(), np.datetime64("NaT"))
+    codes = np.where(codes < 0, len(uniques), codes).reshape(len(columns), len(df))
+    for col, col_codes in zip(columns, codes):
+        df[col] = lookup[col_codes]
+    return df
+
+
+# Skema kolom data gabungan (urutan = urutan kolom keluaran). Jenis kolom:
+# amount : nominal Rupiah ("Rp 1.234.567,00") -> angka, lihat parse_amount
+# rate   : persentase ("10.50 %") -> pecahan (0.105), lihat parse_percentage
+# date   : tanggal -> datetime, lihat normalize_dates
+# count  : frekuensi/jumlah hari -> angka, nilai tak terbaca menjadi NaN
+# code   : nomor rekening/akad, tetap teks supaya nol di depan tidak hilang
+# text   : teks biasa, tidak diubah
+OUTPUT_SCHEMA = {
+    "Nama Group": "text",
+    "Nama Debitur": "text",
+    "BANK": "text",
+    "CABANG": "text",
+    "Kategori": "text",
+    "Tujuan/Jenis Penggunaan": "text",
+    "Plafon": "amount",
+    "Baki Debet/Nominal": "amount",
+    "Suku Bunga/Imbalan": "rate",
+    "Kualitas": "text",
+    "Valuta": "text",
+    "Kondisi": "text",
+    "Tanggal Kondisi": "date",
+    "Tanggal Jatuh Tempo": "date",
+    "Jenis Kredit/LC/Garansi/Surat/Fasilitas": "text",
+    "Tanggal Mulai/Terbit": "date",
+    "Nilai Perolehan/Jaminan/Realisasi": "amount",
+    "Tunggakan Pokok": "amount",
+    "Tunggakan Bunga": "amount",
+    "Frekuensi Tunggakan": "count",
+    "Jumlah Hari Tunggakan": "count",
+    "Tanggal Macet/Wanprestasi": "date",
+    "Sebab Macet": "text",
+    "Keterangan": "text",
+    "No Akad Awal": "code",
+    "Tanggal Akad Awal": "date",
+    "No Akad Akhir": "code",
+    "Tanggal Akad Akhir": "date",
+    "Frekuensi Restrukturisasi": "count",
+    "Cara Restrukturisasi": "text",
+    "Tanggal Restrukturisasi Akhir": "date",
+    "Tanggal Awal Kredit": "date",
+    "Plafon Awal": "amount",
+    "Sifat Kredit/Pembiayaan": "text",
+    "Akad Kredit/Pembiayaan": "text",
+    "Frekuensi Perpanjangan Kredit/": "count",
+    "Kategori Debitur": "text",
+    "Sektor Ekonomi": "text",
+    "Kab/Kota Lokasi Proyek": "text",
+    "Kredit Program Pemerintah": "text",
+    "Jenis Suku Bunga/Imbalan": "text",
+    "Denda": "amount",
+    "Bank Beneficiary": "text",
+    "Nama Yang Dijamin": "text",
+    "Sovereign Rate": "text",
+    "Listing": "text",
+    "Peringkat Surat Berharga": "text",
+    "Nilai Dalam Mata Uang Asal": "text",
+    "No Rek/LC/Surat": "code",
+    "Nilai Pasar/Proyek": "amount",
+}
+
+
+def columns_of_kind(kind, schema=OUTPUT_SCHEMA):
+    """Daftar kolom schema dengan jenis tertentu, sesuai urutan schema"""
+    return [col for col, col_kind in schema.items() if col_kind == kind]
+
+
+def cast_to_schema(df, schema=OUTPUT_SCHEMA):
+    """Mengubah tipe semua kolom sesuai schema dalam satu lintasan.
+
+    Hanya kolom amount, rate, date dan count yang dikonversi; kolom code, text
+    dan kolom di luar schema dibiarkan apa adanya. Dipanggil sekali pada data
+    mentah (teks), karena parse_amount tidak untuk kolom yang sudah berupa angka.
+    """
+    for col in df.columns:
+        kind = schema.get(col)
+        if kind == "amount":
+            df[col] = parse_amount(df[col])
+        elif kind == "rate":
+            df[col] = parse_percentage(df[col], scale=100)
+        elif kind == "count":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return normalize_dates(df, columns_of_kind("date", schema))
+
+
+# Kolom teks dengan rasio nilai unik / jumlah baris tidak lebih dari ini disimpan sebagai category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def compact_dtypes(df, schema=OUTPUT_SCHEMA):
+    """Memperkecil memori DataFrame tanpa mengubah nilainya.
+
+    - text dengan sedikit nilai unik (BANK, Kualitas, Valuta, ...) -> category
+    - amount -> integer terkecil yang muat (nominal sudah tanpa desimal);
+      tidak pernah float32 karena nominal Rupiah bisa melebihi presisinya
+    - count -> float32 (tetap bisa menyimpan NaN, bilangan bulat kecil tetap tepat)
+    """
+    for col in df.columns:
+        kind = schema.get(col)
+        values = df[col]
+        if kind == "amount":
+            if pd.api.types.is_numeric_dtype(values) and values.notna().all() and (values % 1 == 0).all():
+                df[col] = pd.to_numeric(values.astype("int64"), downcast="integer")
+        elif kind == "count":
+            if pd.api.types.is_float_dtype(values):
+                df[col] = values.astype("float32")
+        elif kind == "text" and len(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+            if values.nunique(dropna=True) <= len(values) * CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = values.astype("category")
+    return df
+
+
+def memory_report(df):
+    """Pemakaian memori per kolom (byte, termasuk isi string) beserta dtype-nya"""
+    return pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": df.memory_usage(index=False, deep=True),
+    })
+
+
+# Penyimpanan kolom teks di sepanjang pipeline parsing:
+# - "object": bawaan pandas (str Python per sel di pandas 2)
+# - "pyarrow": string Arrow (buffer kontigu, operasi .str dijalankan pyarrow)
+STRING_STORAGES = ("object", "pyarrow")
+DEFAULT_STRING_STORAGE = "object"
+
+
+def string_dtype(storage):
+    """dtype kolom teks untuk storage; None untuk "object" (dtype ditentukan pandas)"""
+    if storage not in STRING_STORAGES:
+        raise ValueError(f"Penyimpanan string tidak dikenal: {storage!r}")
+    if storage == "object":
+        return None
+    import pyarrow  # noqa: F401  (hanya dibutuhkan untuk storage "pyarrow")
+    try:
+        # Nilai kosong tetap NaN, sama seperti kolom object
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:  # pandas < 2.3
+        return pd.StringDtype("pyarrow_numpy")
+
+
+def storage_of(values):
+    """Storage kolom teks values ("pyarrow" atau "object")"""
+    dtype = values.dtype
+    if isinstance(dtype, pd.StringDtype) and dtype.storage in ("pyarrow", "pyarrow_numpy"):
+        return "pyarrow"
+    return "object"
+
+
+def to_string_storage(df, storage):
+    """Memindahkan kolom object yang berisi string (boleh kosong sebagian) ke storage"""
+    dtype = string_dtype(storage)
+    if dtype is None:
+        return df
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) == "string":
+            df[col] = values.astype(dtype)
+    return df
@@ -0,0 +1,415 @@
+"""Ekspor data final SLIK: Excel berformat dan format kolumnar (Parquet, Arrow IPC).
+
+Untuk format kolumnar, tipe kolom mengikuti OUTPUT_SCHEMA, jadi tanggal tetap
+timestamp, nominal dan persentase tetap angka, dan kolom teks tetap string
+walaupun isinya kosong semua. pyarrow bersifat opsional dan baru diimpor saat
+ekspor kolumnar dipakai.
+
+Modul ini tidak mengimpor streamlit supaya fungsinya bisa dijalankan di proses
+worker (ProcessPoolExecutor) tanpa ikut membangun tampilan aplikasi.
+"""
+import gzip
+import io
+import multiprocessing
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+from cleaning import OUTPUT_SCHEMA, columns_of_kind
+
+# Format angka Excel untuk kolom nominal dan tanggal pada penulis bulk
+EXCEL_AMOUNT_FORMAT = "#,##0"
+EXCEL_DATE_FORMAT = "yyyy-mm-dd h:mm:ss"
+
+# Baris data per sheet: batas baris Excel (1.048.576) dikurangi satu baris header
+EXCEL_MAX_ROWS = 1_048_576 - 1
+
+# Jumlah baris yang diubah ke objek Python sekaligus saat menulis Excel/CSV
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def excel_named_styles():
+    """Style bernama untuk penulis bulk: header navy, data putih berborder abu-abu, nominal & tanggal"""
+    white_side = Side(style='medium', color='FFFFFF')
+    gray_side = Side(style='thin', color='D9D9D9')
+    white_fill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+    gray_border = Border(left=gray_side, right=gray_side, top=gray_side, bottom=gray_side)
+
+    header = NamedStyle(name="SLIK Header")
+    header.fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+    header.font = Font(color="FFFFFF", bold=True)
+    header.border = Border(left=white_side, right=white_side, top=white_side, bottom=white_side)
+
+    styles = {"header": header}
+    for key, number_format in [("data", "General"), ("amount", EXCEL_AMOUNT_FORMAT), ("date", EXCEL_DATE_FORMAT)]:
+        style = NamedStyle(name=f"SLIK {key.capitalize()}", number_format=number_format)
+        style.font = copy(DEFAULT_FONT)
+        style.fill = white_fill
+        style.border = gray_border
+        styles[key] = style
+    return styles
+
+
+def excel_column_widths(df, amount_columns):
+    """Lebar kolom Excel dari teks terpanjang per kolom (termasuk header), dihitung dari DataFrame"""
+    widths = []
+    for col in df.columns:
+        values = df[col].dropna()
+        max_length = len(str(col))
+        if len(values):
+            if col in amount_columns:
+                # Nominal tampil dengan pemisah ribuan; nilai terpanjang ada di minimum atau maksimum
+                max_length = max(max_length, *(len(f"{v:,.0f}") for v in (values.min(), values.max())))
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                max_length = max(max_length, len(str(values.iloc[0])))
+            else:
+                max_length = max(max_length, int(values.astype(str).str.len().max()))
+        widths.append((max_length + 2) * 1.2)
+    return widths
+
+
+def _excel_values(values):
+    """Nilai satu kolom sebagai list objek Python; nilai kosong menjadi None (sel kosong)"""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def save_to_excel_formatted(df, filename, bulk=True, chunk_rows=EXPORT_CHUNK_ROWS, max_rows=EXCEL_MAX_ROWS):
+    """Menyimpan DataFrame ke Excel dengan formatting - baris putih dengan border abu-abu
+
+    filename boleh berupa path atau stream biner yang bisa di-seek (mis. io.BytesIO).
+    bulk=True menulis baris secara streaming (workbook write-only) dengan style
+    bernama yang dipakai bersama semua sel, lebar kolom dihitung dari DataFrame,
+    dan kolom nominal diberi format angka #,##0. Nilai diubah ke objek Python
+    per chunk_rows baris, jadi memori kerja penulis mengikuti ukuran potongan,
+    bukan jumlah baris (jika filename stream memori, isi file hasilnya tetap
+    utuh di memori). Lebih dari max_rows baris data otomatis dilanjutkan ke
+    sheet baru. bulk=False memakai penulisan lama sel per sel (satu sheet).
+    """
+    if bulk:
+        return _save_to_excel_bulk(df, filename, chunk_rows, max_rows)
+
+    # Buat workbook baru
+    wb = Workbook()
+    ws = wb.active
+    
+    # Style border untuk header (putih)
+    white_border = Border(
+        left=Side(style='medium', color='FFFFFF'),
+        right=Side(style='medium', color='FFFFFF'),
+        top=Side(style='medium', color='FFFFFF'),
+        bottom=Side(style='medium', color='FFFFFF')
+    )
+    
+    # Style border untuk data (abu-abu #D9D9D9)
+    gray_border = Border(
+        left=Side(style='thin', color='D9D9D9'),
+        right=Side(style='thin', color='D9D9D9'),
+        top=Side(style='thin', color='D9D9D9'),
+        bottom=Side(style='thin', color='D9D9D9')
+    )
+    
+    # Fill putih untuk semua sel
+    white_fill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+    
+    # Konversi DataFrame ke rows
+    for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), 1):
+        for c_idx, value in enumerate(row, 1):
+            cell = ws.cell(row=r_idx, column=c_idx, value=value)
+            cell.fill = white_fill  # Semua sel berwarna putih
+            
+            # Tentukan border berdasarkan baris
+            if r_idx == 1:  # Header
+                cell.border = white_border
+            else:  # Data rows
+                cell.border = gray_border
+    
+    # Format header - navy dengan font putih
+    header_fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = white_border  # Header tetap border putih
+    
+    # Sesuaikan lebar kolom otomatis
+    for column in ws.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+        adjusted_width = (max_length + 2) * 1.2
+        ws.column_dimensions[column_letter].width = adjusted_width
+    
+    # Simpan file
+    wb.save(filename)
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _save_to_excel_bulk(df, filename, chunk_rows, max_rows):
+    amount_columns = [
+        col for col in columns_of_kind("amount")
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
+    # Lebar kolom harus diketahui sebelum baris pertama ditulis: maksimum dari semua potongan
+    widths = excel_column_widths(df.iloc[:0], amount_columns)
+    for chunk in _chunks(df, chunk_rows):
+        widths = [max(a, b) for a, b in zip(widths, excel_column_widths(chunk, amount_columns))]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    styles = excel_named_styles()
+    for style in styles.values():
+        wb.add_named_style(style)
+
+    # Style setiap jenis sel di-resolve sekali; sel berikutnya hanya menyalin style array-nya
+    style_arrays = {}
+    for key, style in styles.items():
+        template = WriteOnlyCell(ws)
+        template.style = style.name
+        style_arrays[key] = template._style
+
+    column_styles = []
+    for col in df.columns:
+        if col in amount_columns:
+            column_styles.append(style_arrays["amount"])
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            column_styles.append(style_arrays["date"])
+        else:
+            column_styles.append(style_arrays["data"])
+
+    def start_sheet(ws):
+        for idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+        # row/column hanya pengisi; posisi sebenarnya diatur oleh ws.append
+        ws.append([Cell(ws, row=1, column=1, value=str(col), style_array=style_arrays["header"]) for col in df.columns])
+
+    start_sheet(ws)
+    rows_in_sheet = 0
+    for chunk in _chunks(df, chunk_rows):
+        columns = [_excel_values(chunk[col]) for col in chunk.columns]
+        for row in zip(*columns):
+            # Sheet penuh: lanjut ke sheet baru dengan header dan lebar kolom yang sama
+            if rows_in_sheet == max_rows:
+                ws = wb.create_sheet()
+                start_sheet(ws)
+                rows_in_sheet = 0
+            ws.append([Cell(ws, row=1, column=1, value=value, style_array=style) for value, style in zip(row, column_styles)])
+            rows_in_sheet += 1
+
+    wb.save(filename)
+
+
+def excel_bytes(df):
+    """Isi file Excel hasil save_to_excel_formatted, ditulis langsung ke buffer memori.
+
+    st.download_button selalu menyimpan isi download utuh di memori, jadi buffer
+    file sementara tidak menghemat apa pun di aplikasi. Output yang terlalu
+    besar untuk memori ditulis langsung ke file lewat batch_convert.
+    """
+    buffer = io.BytesIO()
+    save_to_excel_formatted(df, buffer)
+    return buffer.getvalue()
+
+
+# Ekspor per debitur: baris dikelompokkan per Nama Group, atau per Nama Debitur jika group kosong
+PARTITION_COLUMNS = ("Nama Group", "Nama Debitur")
+UNNAMED_PARTITION = "Tanpa Nama"
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+def partition_keys(df, columns=PARTITION_COLUMNS):
+    """Nama partisi setiap baris: kolom pertama di columns yang terisi, UNNAMED_PARTITION jika semua kosong"""
+    keys = pd.Series(UNNAMED_PARTITION, index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col in df.columns:
+            values = df[col].astype(object)
+            text = values.where(values.notna(), "").astype(str).str.strip()
+            keys = keys.where(text.eq(""), text)
+    return keys
+
+
+def _partition_filename(key, used):
+    name = _UNSAFE_FILENAME.sub("_", key).strip(" .")[:100] or UNNAMED_PARTITION
+    candidate, n = name, 1
+    # Nama file dibandingkan tanpa huruf besar/kecil supaya tidak bentrok saat ZIP diekstrak di Windows
+    while candidate.lower() in used:
+        n += 1
+        candidate = f"{name} ({n})"
+    used.add(candidate.lower())
+    return candidate + ".xlsx"
+
+
+def split_partitions(df, columns=PARTITION_COLUMNS):
+    """(nama file .xlsx, DataFrame) per partisi, urut sesuai kemunculan pertama di df.
+
+    Generator: DataFrame setiap partisi baru dibuat saat diminta.
+    """
+    codes, uniques = pd.factorize(partition_keys(df, columns))
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    used = set()
+    for i, key in enumerate(uniques):
+        yield _partition_filename(key, used), df.iloc[order[bounds[i]:bounds[i + 1]]]
+
+
+def partitioned_excel_zip(df, target, max_workers=1, progress_callback=None, columns=PARTITION_COLUMNS):
+    """Menulis satu workbook per partisi (lihat split_partitions) ke ZIP di target (path atau stream biner).
+
+    Workbook dibuat paralel di proses worker jika max_workers > 1. Paling banyak
+    2 x max_workers workbook yang sedang dibuat atau menunggu ditulis, jadi
+    memori tidak tumbuh dengan jumlah partisi; isi ZIP tetap urut partisi.
+    progress_callback(selesai, total, nama_file) dipanggil setiap satu workbook
+    masuk ke ZIP. Mengembalikan jumlah workbook.
+    """
+    total = partition_keys(df, columns).nunique()
+    selesai = 0
+
+    # xlsx sudah terkompresi, jadi isi ZIP cukup disimpan tanpa kompresi ulang
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_STORED) as zf:
+        def tulis(name, data):
+            nonlocal selesai
+            zf.writestr(name, data)
+            selesai += 1
+            if progress_callback:
+                progress_callback(selesai, total, name)
+
+        if max_workers <= 1:
+            for name, part in split_partitions(df, columns):
+                tulis(name, excel_bytes(part))
+            return selesai
+
+        # spawn, bukan fork: lihat extraction.process_pool
+        spawn = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=spawn) as executor:
+            pending = deque()
+            for name, part in split_partitions(df, columns):
+                pending.append((name, executor.submit(excel_bytes, part)))
+                if len(pending) >= 2 * max_workers:
+                    name, future = pending.popleft()
+                    tulis(name, future.result())
+            while pending:
+                name, future = pending.popleft()
+                tulis(name, future.result())
+    return selesai
+
+
+def partitioned_excel_zip_bytes(df, **kwargs):
+    """Isi ZIP hasil partitioned_excel_zip, ditulis langsung ke buffer memori (lihat excel_bytes)"""
+    buffer = io.BytesIO()
+    partitioned_excel_zip(df, buffer, **kwargs)
+    return buffer.getvalue()
+
+
+# Format kolumnar: nama -> (ekstensi file, mime type)
+COLUMNAR_FORMATS = {
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+}
+DEFAULT_COLUMNAR_FORMAT = "parquet"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Ekspor Parquet/Arrow membutuhkan paket pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def arrow_schema(df, schema=OUTPUT_SCHEMA):
+    """Schema Arrow untuk df: text/code -> string (dictionary jika category), date -> timestamp, angka apa adanya"""
+    pa = _pyarrow()
+    fields = []
+    for col in df.columns:
+        kind = schema.get(col)
+        dtype = df[col].dtype
+        if kind is None:
+            # Kolom di luar schema: jenisnya ditebak dari dtype
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                kind = "date"
+            elif pd.api.types.is_numeric_dtype(dtype):
+                kind = "count"
+            else:
+                kind = "text"
+
+        if kind == "date":
+            arrow_type = pa.timestamp("ns")
+        elif kind in ("amount", "rate", "count"):
+            arrow_type = pa.from_numpy_dtype(dtype) if pd.api.types.is_numeric_dtype(dtype) else pa.float64()
+        elif isinstance(dtype, pd.CategoricalDtype):
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(str(col), arrow_type))
+    return pa.schema(fields)
+
+
+def to_arrow_table(df, schema=OUTPUT_SCHEMA):
+    """DataFrame -> pyarrow.Table dengan arrow_schema; index tidak ikut disimpan"""
+    pa = _pyarrow()
+    return pa.Table.from_pandas(df, schema=arrow_schema(df, schema), preserve_index=False)
+
+
+def write_columnar(df, target, fmt=DEFAULT_COLUMNAR_FORMAT, schema=OUTPUT_SCHEMA):
+    """Menulis df ke target (path atau stream biner) sebagai Parquet atau Arrow IPC (file)"""
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Format kolumnar tidak dikenal: {fmt!r}")
+    pa = _pyarrow()
+    table = to_arrow_table(df, schema)
+    if fmt == "parquet":
+        pa.parquet.write_table(table, target)
+    else:
+        with pa.ipc.new_file(target, table.schema) as writer:
+            writer.write_table(table)
+
+
+def columnar_bytes(df, fmt=DEFAULT_COLUMNAR_FORMAT, schema=OUTPUT_SCHEMA):
+    """Isi file Parquet/Arrow untuk df, untuk tombol download"""
+    buffer = io.BytesIO()
+    write_columnar(df, buffer, fmt, schema)
+    return buffer.getvalue()
+
+
+def write_csv_gz(df, target, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Menulis df sebagai CSV (UTF-8) terkompresi gzip ke target (path atau stream biner), per chunk_rows baris"""
+    with gzip.open(target, "wt", encoding="utf-8", newline="") as f:
+        if len(df) == 0:
+            df.to_csv(f, index=False)
+        for i, chunk in enumerate(_chunks(df, chunk_rows)):
+            chunk.to_csv(f, index=False, header=i == 0)
+
+
+# Format download tambahan selain Excel: nama -> (ekstensi file, mime type)
+DOWNLOAD_FORMATS = {**COLUMNAR_FORMATS, "csv.gz": (".csv.gz", "application/gzip")}
+
+
+def export_bytes(df, fmt=DEFAULT_COLUMNAR_FORMAT):
+    """Isi file df dalam salah satu DOWNLOAD_FORMATS, untuk tombol download (lihat excel_bytes)"""
+    if fmt == "csv.gz":
+        buffer = io.BytesIO()
+        write_csv_gz(df, buffer)
+        return buffer.getvalue()
+    return columnar_bytes(df, fmt)
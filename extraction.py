@@ -0,0 +1,428 @@
+"""Ekstraksi teks halaman dari file PDF SLIK.
+
+Modul ini sengaja tidak mengimpor streamlit supaya fungsinya bisa dijalankan
+di proses worker (ProcessPoolExecutor) tanpa ikut membangun tampilan aplikasi.
+"""
+import gzip
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pdfplumber
+
+# Jumlah worker bawaan untuk ekstraksi paralel: satu proses per core, paling banyak
+# MAX_DEFAULT_WORKERS karena setiap sesi Streamlit membuat pool prosesnya sendiri
+MAX_DEFAULT_WORKERS = 4
+DEFAULT_WORKERS = min(MAX_DEFAULT_WORKERS, os.cpu_count() or 1)
+
+# Laporan dengan halaman lebih sedikit dari ini tidak dipecah per halaman
+MIN_SHARD_PAGES = 25
+
+# Backend ekstraksi teks yang didukung
+EXTRACTION_BACKENDS = ("pdfplumber", "pymupdf")
+DEFAULT_BACKEND = "pdfplumber"
+
+# Naikkan setiap kali hasil ekstraksi berubah supaya entri cache lama tidak dipakai lagi
+EXTRACTOR_VERSION = "2"
+
+# Batas ukuran bawaan cache teks halaman (bisa diubah lewat SLIK_CACHE_MAX_MB)
+DEFAULT_CACHE_MAX_MB = 512
+
+# Toleransi vertikal (pt) untuk menganggap dua kata satu baris, sama dengan bawaan pdfplumber
+Y_TOLERANCE = 3
+
+# Karakter watermark/overlay: berwarna terang (abu-abu muda, setelah transparansi)
+# DAN berputar, jauh lebih besar dari teks isi halaman, atau semi-transparan.
+# Teks terang yang tegak dan berukuran isi (mis. header abu-abu) tetap dipakai.
+OVERLAY_SIZE_RATIO = 2.0
+OVERLAY_MIN_LIGHTNESS = 0.5
+
+# Penanda halaman SLIK; tidak boleh hilang karena filter overlay (lihat _keep_page_marker)
+PAGE_MARKER = "Sistem Layanan Informasi Keuangan"
+
+
+def _lightness(color):
+    """Kecerahan 0 (hitam) - 1 (putih) dari warna pdfplumber (gray, RGB atau CMYK)"""
+    if not isinstance(color, (tuple, list)) or not all(isinstance(c, (int, float)) for c in color):
+        return 0.0  # Pattern/warna tak dikenal dianggap teks biasa
+    if len(color) == 1:
+        return color[0]
+    if len(color) == 3:
+        return min(color)
+    if len(color) == 4:
+        return 1 - max(color)
+    return 0.0
+
+
+def _body_size(sizes):
+    return statistics.median(sizes) if sizes else 0
+
+
+def _pdfplumber_drop_overlay(page):
+    """Halaman pdfplumber tanpa karakter watermark; halaman tanpa watermark dikembalikan apa adanya"""
+    max_size = _body_size([char["size"] for char in page.chars]) * OVERLAY_SIZE_RATIO
+
+    def keep(obj):
+        if obj.get("object_type") != "char":
+            return True
+        return (
+            _lightness(obj.get("non_stroking_color")) < OVERLAY_MIN_LIGHTNESS
+            or (obj.get("upright", True) and obj["size"] <= max_size)
+        )
+
+    if all(keep(char) for char in page.chars):
+        return page
+    return page.filter(keep)
+
+
+def _pymupdf():
+    try:
+        import pymupdf
+    except ImportError:  # PyMuPDF < 1.24 hanya menyediakan nama modul fitz
+        import fitz as pymupdf
+    return pymupdf
+
+
+def _open_pymupdf(pdf_file):
+    return _pymupdf().open(pdf_file)
+
+
+def _pymupdf_is_overlay(line, span, max_size):
+    color = span["color"]
+    alpha = span.get("alpha", 255) / 255
+    # Kecerahan setelah dicampur dengan latar putih sesuai transparansi
+    lightness = 1 - (1 - min((color >> 16) & 255, (color >> 8) & 255, color & 255) / 255) * alpha
+    return lightness >= OVERLAY_MIN_LIGHTNESS and (
+        abs(line["dir"][1]) > 1e-3  # Baris miring/berputar
+        or span["size"] > max_size
+        or alpha < 1
+    )
+
+
+def _pymupdf_words(page):
+    """Kata (x0, y0, x1, y1, teks) halaman PyMuPDF tanpa span watermark, dan apakah ada yang dibuang.
+
+    Halaman tanpa watermark langsung memakai page.get_text("words"). Jika ada,
+    kata disusun ulang dari karakter rawdict dengan aturan yang sama: dipisah
+    spasi dan batas baris, bbox kata adalah gabungan bbox karakternya.
+    """
+    textpage = page.get_textpage(flags=_pymupdf().TEXTFLAGS_WORDS)
+    lines = [
+        line for block in page.get_text("dict", textpage=textpage)["blocks"]
+        for line in block.get("lines", ())
+    ]
+    max_size = _body_size([span["size"] for line in lines for span in line["spans"]]) * OVERLAY_SIZE_RATIO
+    if not any(_pymupdf_is_overlay(line, span, max_size) for line in lines for span in line["spans"]):
+        return page.get_text("words", textpage=textpage), False
+
+    words = []
+    for block in page.get_text("rawdict", textpage=textpage)["blocks"]:
+        for line in block.get("lines", ()):
+            chars = [
+                char for span in line["spans"] if not _pymupdf_is_overlay(line, span, max_size)
+                for char in span["chars"]
+            ]
+            word = []
+            for char in chars + [None]:
+                if char is not None and not char["c"].isspace():
+                    word.append(char)
+                    continue
+                if word:
+                    words.append((
+                        min(c["bbox"][0] for c in word), min(c["bbox"][1] for c in word),
+                        max(c["bbox"][2] for c in word), max(c["bbox"][3] for c in word),
+                        "".join(c["c"] for c in word),
+                    ))
+                    word = []
+    return words, True
+
+
+def _keep_page_marker(text, unfiltered_text):
+    """Teks tersaring, kecuali jika penyaringan membuang PAGE_MARKER: teks tanpa saringan dipakai"""
+    if PAGE_MARKER in text:
+        return text
+    unfiltered_text = unfiltered_text()
+    return unfiltered_text if PAGE_MARKER in unfiltered_text else text
+
+
+def _pymupdf_page_text(page, drop_overlay=True):
+    """Teks halaman PyMuPDF, tanpa karakter watermark jika drop_overlay"""
+    if not drop_overlay:
+        return _words_to_text(page.get_text("words"))
+    words, dropped = _pymupdf_words(page)
+    text = _words_to_text(words)
+    if dropped:
+        text = _keep_page_marker(text, lambda: _words_to_text(page.get_text("words")))
+    return text
+
+
+def _words_to_text(words):
+    """Menyusun teks dari kata PyMuPDF per baris seperti page.extract_text() pdfplumber.
+
+    Kata dikelompokkan menjadi baris berdasarkan posisi atas (toleransi
+    Y_TOLERANCE), diurutkan dari kiri ke kanan dan digabung dengan satu spasi,
+    sehingga parser process_*_data melihat pemisah baris yang sama.
+    """
+    words = sorted(words, key=lambda word: word[1])
+    lines = []
+    last_top = None
+    for word in words:
+        if last_top is None or word[1] - last_top > Y_TOLERANCE:
+            lines.append([])
+        lines[-1].append(word)
+        last_top = word[1]
+
+    return "\n".join(
+        " ".join(word[4] for word in sorted(line, key=lambda word: word[0]))
+        for line in lines
+    )
+
+
+def extract_page_texts(pdf_file, pages=None, backend=DEFAULT_BACKEND, drop_overlay=True):
+    """Mengambil teks dari setiap halaman PDF.
+
+    pages (opsional) berisi nomor halaman mulai dari 1; None = semua halaman.
+    backend: "pdfplumber" atau "pymupdf" (jauh lebih cepat per halaman).
+    drop_overlay: buang karakter watermark/overlay sebelum teks disusun, supaya
+    huruf watermark tidak menyisip ke teks isi (mis. nama bulan yang rusak).
+    Halaman yang kehilangan PAGE_MARKER karena filter ini memakai teks tanpa filter.
+    """
+    text_data = []  # LIST SIMPAN TEKS DARI SETIAP PAGE
+
+    if backend == "pymupdf":
+        with _open_pymupdf(pdf_file) as doc:
+            page_numbers = pages if pages is not None else range(1, doc.page_count + 1)
+            for page_number in page_numbers:
+                text = _pymupdf_page_text(doc[page_number - 1], drop_overlay)
+                if text:
+                    text_data.append(text)
+        return text_data
+
+    if backend != "pdfplumber":
+        raise ValueError(f"Backend ekstraksi tidak dikenal: {backend}")
+
+    with pdfplumber.open(pdf_file, pages=pages) as pdf:
+        for page in pdf.pages:
+            filtered = _pdfplumber_drop_overlay(page) if drop_overlay else page
+            text = filtered.extract_text()
+            if filtered is not page:
+                text = _keep_page_marker(text, page.extract_text)
+            if text:
+                text_data.append(text)
+
+    return text_data
+
+
+def count_pages(pdf_file, backend=DEFAULT_BACKEND):
+    """Menghitung jumlah halaman PDF"""
+    if backend == "pymupdf":
+        with _open_pymupdf(pdf_file) as doc:
+            return doc.page_count
+    with pdfplumber.open(pdf_file) as pdf:
+        return len(pdf.pages)
+
+
+def process_pool(max_workers):
+    """ProcessPoolExecutor dengan start method spawn.
+
+    fork dari server Streamlit yang multithread bisa membuat proses anak
+    deadlock (lock milik thread lain ikut tersalin dalam keadaan terkunci);
+    spawn memulai worker dari interpreter baru.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def page_shards(n_pages, max_workers, min_shard_pages=MIN_SHARD_PAGES):
+    """Membagi rentang halaman menjadi beberapa shard berurutan.
+
+    Hasilnya list nomor halaman per shard, atau [None] jika laporan terlalu
+    kecil untuk dipecah (diekstrak utuh dalam satu tugas).
+    """
+    shard_size = max(min_shard_pages, math.ceil(n_pages / max(max_workers, 1)))
+    if n_pages <= shard_size:
+        return [None]
+    return [
+        list(range(start + 1, min(start + shard_size, n_pages) + 1))
+        for start in range(0, n_pages, shard_size)
+    ]
+
+
+def _write_json(text_data, json_file_path):
+    # SIMPAN TEKS DALAM FORMAT JSON
+    with open(json_file_path, 'w', encoding='utf-8') as output_file:
+        json.dump(text_data, output_file, ensure_ascii=False, indent=4)
+
+
+def pdf_to_json(pdf_file, json_file_path, backend=DEFAULT_BACKEND, drop_overlay=True):
+    """Mengkonversi file PDF ke JSON"""
+    text_data = extract_page_texts(pdf_file, backend=backend, drop_overlay=drop_overlay)
+    _write_json(text_data, json_file_path)
+    return text_data
+
+
+class PageTextCache:
+    """Cache teks per halaman di disk, dengan kunci hash isi PDF + versi ekstraktor.
+
+    Setiap entri berisi list teks yang sama dengan hasil pdf_to_json. Ukuran
+    total dibatasi max_bytes; entri yang paling lama tidak dipakai dihapus
+    lebih dulu (LRU berdasarkan mtime file). Lokasi dan batas ukuran bawaan
+    bisa diatur lewat environment SLIK_CACHE_DIR dan SLIK_CACHE_MAX_MB.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = (
+            cache_dir
+            or os.environ.get("SLIK_CACHE_DIR")
+            or os.path.join(tempfile.gettempdir(), "slik-page-cache")
+        )
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("SLIK_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, pdf_file, backend=DEFAULT_BACKEND, drop_overlay=True):
+        """Kunci cache: sha256 dari versi ekstraktor, opsi ekstraksi dan isi file PDF"""
+        digest = hashlib.sha256(f"{EXTRACTOR_VERSION}|{backend}|{int(drop_overlay)}|".encode("utf-8"))
+        with open(pdf_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json.gz")
+
+    def get(self, key):
+        """Mengambil list teks halaman dari cache, None jika belum ada"""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                text_data = json.load(f)
+            os.utime(path)  # Tandai baru dipakai untuk urutan LRU
+        except (OSError, EOFError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text_data
+
+    def put(self, key, text_data):
+        """Menyimpan list teks halaman lalu membuang entri lama jika melebihi batas ukuran"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(text_data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".json.gz"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # Sudah dihapus sesi lain
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def extract_pdfs(pdf_paths, max_workers=1, progress_callback=None, min_shard_pages=MIN_SHARD_PAGES,
+                 backend=DEFAULT_BACKEND, cache=None, drop_overlay=True):
+    """Mengambil teks halaman dari banyak PDF, paralel jika max_workers > 1.
+
+    Laporan besar dipecah per rentang halaman (lihat page_shards) supaya satu
+    file ratusan halaman juga dikerjakan beberapa worker; teks per shard
+    digabung kembali sesuai urutan halaman. Jika cache (PageTextCache)
+    diberikan, file yang isinya sudah pernah diekstrak tidak diekstrak ulang.
+    Hasil (list teks per halaman untuk setiap file) mengikuti urutan pdf_paths.
+    progress_callback(selesai, total, pdf_path) dipanggil setiap satu file selesai.
+    """
+    total = len(pdf_paths)
+    results = [None] * total
+    selesai = 0
+
+    def selesaikan(i, text_data, key=None):
+        nonlocal selesai
+        if key is not None:
+            cache.put(key, text_data)
+        results[i] = text_data
+        selesai += 1
+        if progress_callback:
+            progress_callback(selesai, total, pdf_paths[i])
+
+    # Cache hit langsung selesai tanpa ekstraksi
+    pending = []
+    for i, pdf_path in enumerate(pdf_paths):
+        key = cache.key(pdf_path, backend, drop_overlay) if cache is not None else None
+        text_data = cache.get(key) if key is not None else None
+        if text_data is not None:
+            selesaikan(i, text_data)
+        else:
+            pending.append((i, key))
+
+    if max_workers <= 1:
+        for i, key in pending:
+            selesaikan(i, extract_page_texts(pdf_paths[i], backend=backend, drop_overlay=drop_overlay), key)
+        return results
+
+    with process_pool(max_workers) as executor:
+        # Jumlah halaman juga dihitung di worker (k None); shard suatu file
+        # dikirim begitu jumlah halamannya diketahui
+        futures = {executor.submit(count_pages, pdf_paths[i], backend): (i, None, key) for i, key in pending}
+        shard_results = {}
+        sisa_shard = {}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, k, key = futures.pop(future)
+                if k is None:
+                    shards = page_shards(future.result(), max_workers, min_shard_pages)
+                    shard_results[i] = [None] * len(shards)
+                    sisa_shard[i] = len(shards)
+                    for k, pages in enumerate(shards):
+                        task = executor.submit(extract_page_texts, pdf_paths[i], pages, backend, drop_overlay)
+                        futures[task] = (i, k, key)
+                    continue
+
+                shard_results[i][k] = future.result()
+                sisa_shard[i] -= 1
+                if sisa_shard[i]:
+                    continue
+
+                # Semua shard file ini selesai: gabungkan sesuai urutan halaman
+                text_data = [text for shard in shard_results.pop(i) for text in shard]
+                selesaikan(i, text_data, key)
+
+    return results
+
+
+def convert_pdfs_to_json(jobs, **kwargs):
+    """Seperti extract_pdfs, tetapi juga menyimpan teks setiap file ke JSON.
+
+    jobs berisi pasangan (pdf_path, json_path). Dipakai hanya untuk artefak
+    debug; pipeline utama memakai hasil extract_pdfs langsung dari memori.
+    """
+    results = extract_pdfs([pdf_path for pdf_path, _ in jobs], **kwargs)
+    for (_, json_path), text_data in zip(jobs, results):
+        _write_json(text_data, json_path)
+    return results
@@ -0,0 +1,789 @@
+"""Parsing teks halaman SLIK per jenis fasilitas dan penggabungan & cleaning data final.
+
+Ini pipeline yang sama untuk aplikasi Streamlit (webapp) dan batch_convert.
+Modul ini tidak mengimpor streamlit: pesan progres dikirim lewat report /
+report_table ke logger, kecuali aplikasi memasang penerimanya sendiri dengan
+set_reporter.
+"""
+import functools
+import logging
+import os
+import re
+
+import pandas as pd
+
+from bank_reference import KODEBANK_PATH, RESOLVED_COLUMNS, file_signature, load_bank_index
+from cleaning import (
+    DEFAULT_STRING_STORAGE,
+    OUTPUT_SCHEMA,
+    cast_to_schema,
+    compact_dtypes,
+    memory_report,
+    parse_percentage,
+    storage_of,
+    string_dtype,
+    to_string_storage,
+)
+from extraction import PAGE_MARKER
+from polars_engine import DEFAULT_COMBINE_ENGINE, combine_and_clean_polars
+
+# Logger progres pemrosesan saat berjalan tanpa UI (lihat report)
+logger = logging.getLogger(__name__)
+
+# Level logging untuk setiap jenis pesan report
+REPORT_LOG_LEVELS = {"info": logging.INFO, "success": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+
+def log_report(level, message):
+    """Pesan progres ke logger; penerima bawaan tanpa UI (CLI, cron)"""
+    logger.log(REPORT_LOG_LEVELS[level], message)
+
+def log_report_table(title, df):
+    """Tabel rincian ke logger level DEBUG; penerima bawaan tanpa UI"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s\n%s", title, df.to_string())
+
+# Penerima pesan progres dan tabel rincian (lihat set_reporter)
+_reporters = {"message": log_report, "table": log_report_table}
+
+def set_reporter(message=log_report, table=log_report_table):
+    """Memasang penerima pesan progres (level, message) dan tabel rincian (title, df)"""
+    _reporters["message"] = message
+    _reporters["table"] = table
+
+def report(level, message):
+    """Pesan progres level "info", "success", "warning" atau "error" ke penerima yang terpasang"""
+    _reporters["message"](level, message)
+
+def report_table(title, df):
+    """Tabel rincian ke penerima yang terpasang"""
+    _reporters["table"](title, df)
+
+def read_json_files(json_files):
+    """Membaca semua file JSON dan menggabungkannya"""
+    dataframes = []
+    for json_file in json_files:
+        try:
+            df = pd.read_json(json_file)  
+            dataframes.append(df)
+        except Exception as e:
+            report("error", f"Gagal membaca file {json_file}: {str(e)}")
+    
+    if not dataframes:
+        return None
+    
+    combined_df = pd.concat(dataframes, ignore_index=True)
+    return combined_df
+
+def build_combined_data(text_lists, string_storage=DEFAULT_STRING_STORAGE):
+    """Menggabungkan teks halaman semua file langsung menjadi DataFrame (tanpa JSON)
+
+    string_storage menentukan penyimpanan kolom teks; tahap parsing berikutnya
+    mengikuti storage kolom 0 ini (lihat STRING_STORAGES).
+    """
+    pages = [text for text_data in text_lists for text in text_data]
+    if not pages:
+        return None
+    # Kolom 0 berisi teks satu halaman per baris, sama seperti hasil read_json_files
+    return pd.DataFrame({0: pages}, dtype=string_dtype(string_storage))
+
+# Penanda halaman yang selalu ikut dipindai oleh semua jenis fasilitas (halaman informasi debitur)
+PENANDA_HALAMAN_UMUM = PAGE_MARKER
+
+def _nilai_setelah(label):
+    """Extractor bawaan: teks setelah label pada baris yang sama"""
+    return lambda line: {label: line.split(label)[1].strip()}
+
+def _nomor_dan_kualitas(label):
+    """Extractor baris nomor fasilitas & kualitas"""
+    return lambda line: {
+        label: line.split(label)[1].strip("Kualitas")[0].strip(),
+        "Kualitas": line.split("Kualitas")[1].strip(),
+    }
+
+def _suku_bunga_dan_jenis(line):
+    """Extractor baris suku bunga & jenis suku bunga (kredit)"""
+    return {
+        "Suku Bunga/Imbalan": line.split(" ")[2],
+        "Jenis Suku Bunga/Imbalan": line.split("Jenis Suku Bunga/Imbalan")[1].strip(),
+    }
+
+def _fields(*specs):
+    """Daftar field: (label, label lain yang wajib ada di baris, extractor).
+
+    Label berupa string biasa memakai extractor _nilai_setelah(label).
+    """
+    return [
+        (spec, None, _nilai_setelah(spec)) if isinstance(spec, str) else spec
+        for spec in specs
+    ]
+
+# Definisi setiap jenis fasilitas untuk pemindai baris gabungan (scan_facility_lines).
+# marker          : halaman ikut dipindai jika memuat marker ini atau PENANDA_HALAMAN_UMUM
+# columns         : kolom awal record (urutan kolom DataFrame)
+# bank_after      : BANK hanya diambil jika baris sebelumnya memuat teks ini (None = selalu)
+# fields          : label di awal baris beserta extractor-nya (lihat LABEL_PATTERN)
+# splits          : pasangan (kolom, penanda) untuk split_label_pairs; teks setelah
+#                   penanda dipindah ke kolom baru bernama penanda itu
+# keterangan_after: record disimpan saat baris Keterangan didahului salah satu teks ini
+FACILITY_SECTIONS = {
+    "kredit": {
+        "marker": "Jenis Kredit/Pembiayaan",
+        "columns": [
+            "BANK", "Baki Debet", "No Rekening", "Kualitas", "Jenis Kredit/Pembiayaan",
+            "Akad Kredit/Pembiayaan", "Frekuensi Perpanjangan Kredit/", "No Akad Awal",
+            "Tanggal Akad Awal", "No Akad Akhir", "Tanggal Akad Akhir", "Tanggal Awal Kredit",
+            "Tanggal Mulai", "Tanggal Jatuh Tempo", "Kategori Debitur", "Jenis Penggunaan",
+            "Sektor Ekonomi", "Kredit Program Pemerintah", "Kab/Kota Lokasi Proyek", "Valuta",
+            "Suku Bunga/Imbalan", "Jenis Suku Bunga/Imbalan", "Keterangan", "Nama Debitur", "Nama Group",
+        ],
+        "bank_after": "Pelapor Cabang",
+        "fields": _fields(
+            ("No Rekening", "Kualitas", _nomor_dan_kualitas("No Rekening")),
+            "Sifat Kredit/Pembiayaan",
+            "Jenis Kredit/Pembiayaan",
+            "Akad Kredit/Pembiayaan",
+            "Frekuensi Perpanjangan Kredit/",
+            "No Akad Awal",
+            "Tanggal Akad Awal",
+            "No Akad Akhir",
+            "Tanggal Akad Akhir",
+            "Tanggal Awal Kredit",
+            "Tanggal Mulai",
+            "Tanggal Jatuh Tempo",
+            "Kategori Debitur",
+            "Jenis Penggunaan",
+            "Sektor Ekonomi",
+            "Kredit Program Pemerintah",
+            "Kab/Kota Lokasi Proyek",
+            "Valuta",
+            ("Suku Bunga/Imbalan", "Jenis Suku Bunga/Imbalan", _suku_bunga_dan_jenis),
+        ),
+        "keterangan_after": ("Jenis Suku Bunga/Imbalan",),
+        "splits": [
+            ("Sifat Kredit/Pembiayaan", "Jumlah Hari Tunggakan"),
+            ("Jenis Kredit/Pembiayaan", "Nilai Proyek"),
+            ("Akad Kredit/Pembiayaan", "Plafon Awal"),
+            ("Frekuensi Perpanjangan Kredit/", "Plafon"),
+            ("No Akad Awal", "Realisasi/Pencairan Bulan Berjalan"),
+            ("Tanggal Akad Awal", "Nilai dalam Mata Uang Asal"),
+            ("No Akad Akhir", "Sebab Macet"),
+            ("Tanggal Akad Akhir", "Tanggal Macet"),
+            ("Tanggal Awal Kredit", "Tunggakan Pokok"),
+            ("Tanggal Mulai", "Tunggakan Bunga"),
+            ("Tanggal Jatuh Tempo", "Frekuensi Tunggakan"),
+            ("Kategori Debitur", "Denda"),
+            ("Jenis Penggunaan", "Frekuensi Restrukturisasi"),
+            ("Sektor Ekonomi", "Tanggal Restrukturisasi Akhir"),
+            ("Kredit Program Pemerintah", "Cara Restrukturisasi"),
+            ("Kab/Kota Lokasi Proyek", "Kondisi"),
+            ("Valuta", "Tanggal Kondisi"),
+        ],
+    },
+    "lc": {
+        "marker": "Jenis L/C",
+        "columns": [
+            "BANK", "Baki Debet", "No L/C", "Kualitas", "Jenis L/C", "Tanggal Keluar",
+            "Tanggal Jatuh Tempo", "No Akad Awal", "Tanggal Akad Awal", "No Akad Akhir",
+            "Tanggal Akad Akhir", "Bank Beneficiary", "Keterangan", "Nama Debitur", "Nama Group",
+        ],
+        "bank_after": "Pelapor Cabang",
+        "fields": _fields(
+            ("No L/C", "Kualitas", _nomor_dan_kualitas("No L/C")),
+            "Jenis L/C",
+            "Tanggal Keluar",
+            "Tanggal Jatuh Tempo",
+            ("No Akad Awal", "Setoran Jaminan", _nilai_setelah("No Akad Awal")),
+            "Tanggal Akad Awal",
+            "No Akad Akhir",
+            "Tanggal Akad Akhir",
+            "Bank Beneficiary",
+        ),
+        "keterangan_after": ("Bank Beneficiary",),
+        "splits": [
+            ("Jenis L/C", "Valuta"),
+            ("Tanggal Keluar", "Plafon"),
+            ("Tanggal Jatuh Tempo", "Tujuan L/C"),
+            ("No Akad Awal", "Setoran Jaminan"),
+            ("Tanggal Akad Awal", "Tanggal Wan Prestasi"),
+            ("No Akad Akhir", "Kondisi"),
+            ("Tanggal Akad Akhir", "Tanggal Kondisi"),
+        ],
+    },
+    "garansi": {
+        "marker": "Jenis Garansi",
+        "columns": [
+            "BANK", "Baki Debet", "No Rekening", "Kualitas", "Jenis Garansi", "Tanggal Diterbitkan",
+            "Tanggal Jatuh Tempo", "No Akad Awal", "Tanggal Akad Awal", "No Akad Akhir",
+            "Tanggal Akad Akhir", "Nama Yang Dijamin", "Keterangan", "Nama Debitur", "Nama Group",
+        ],
+        "bank_after": None,
+        "fields": _fields(
+            ("No Rekening", "Kualitas", _nomor_dan_kualitas("No Rekening")),
+            "Jenis Garansi",
+            "Tanggal Diterbitkan",
+            "Tanggal Jatuh Tempo",
+            "No Akad Awal",
+            "Tanggal Akad Awal",
+            "No Akad Akhir",
+            "Tanggal Akad Akhir",
+            "Nama Yang Dijamin",
+        ),
+        "keterangan_after": ("Nama Yang Dijamin",),
+        "splits": [
+            ("Jenis Garansi", "Valuta"),
+            ("Tanggal Diterbitkan", "Plafon"),
+            ("Tanggal Jatuh Tempo", "Tujuan Garansi"),
+            ("No Akad Awal", "Setoran Jaminan"),
+            ("Tanggal Akad Awal", "Tanggal Wan Prestasi"),
+            ("No Akad Akhir", "Kondisi"),
+            ("Tanggal Akad Akhir", "Tanggal Kondisi"),
+        ],
+    },
+    "surat": {
+        "marker": "Jenis Surat Berharga",
+        "columns": [
+            "BANK", "Baki Debet", "No Surat Berharga", "Kualitas", "Jenis Surat Berharga",
+            "Sovereign Rate", "Listing", "Peringkat Surat Berharga", "Tujuan Kepemilikan",
+            "Tanggal Terbit", "Tanggal Jatuh Tempo", "Suku Bunga/Imbalan", "Kode Valuta",
+            "Keterangan", "Nama Debitur", "Nama Group",
+        ],
+        "bank_after": None,
+        "fields": _fields(
+            ("No Surat Berharga", "Kualitas", _nomor_dan_kualitas("No Surat Berharga")),
+            "Jenis Surat Berharga",
+            "Sovereign Rate",
+            "Listing",
+            "Peringkat Surat Berharga",
+            "Tujuan Kepemilikan",
+            "Tanggal Terbit",
+            "Tanggal Jatuh Tempo",
+            "Suku Bunga/Imbalan",
+            "Kode Valuta",
+        ),
+        "keterangan_after": ("Kode Valuta", "Tanggal Kondisi"),
+        "splits": [
+            ("Jenis Surat Berharga", "Jumlah Hari Tunggakan"),
+            ("Sovereign Rate", "Nilai Dalam Mata Uang Asal"),
+            ("Listing", "Nilai Pasar"),
+            ("Peringkat Surat Berharga", "Nilai Perolehan"),
+            ("Tujuan Kepemilikan", "Tunggakan"),
+            ("Tanggal Terbit", "Tanggal Macet"),
+            ("Tanggal Jatuh Tempo", "Sebab Macet"),
+            ("Suku Bunga/Imbalan", "Kondisi"),
+            ("Kode Valuta", "Tanggal Kondisi"),
+        ],
+    },
+    "fasilitas": {
+        "marker": "Jenis Fasilitas",
+        "columns": [
+            "BANK", "Baki Debet", "No Rekening", "Kualitas", "Jenis Fasilitas", "Tanggal Mulai",
+            "Tanggal Jatuh Tempo", "Valuta", "Nilai Dalam Mata Uang Asal", "Suku Bunga/Imbalan",
+            "Keterangan", "Nama Debitur", "Nama Group",
+        ],
+        "bank_after": None,
+        "fields": _fields(
+            ("No Rekening", "Kualitas", _nomor_dan_kualitas("No Rekening")),
+            "Jenis Fasilitas",
+            "Tanggal Mulai",
+            "Tanggal Jatuh Tempo",
+            "Valuta",
+            "Nilai Dalam Mata Uang Asal",
+            "Suku Bunga/Imbalan",
+        ),
+        "keterangan_after": ("Suku Bunga/Imbalan", "Tanggal Kondisi"),
+        "splits": [
+            ("Jenis Fasilitas", "Jumlah Hari Tunggakan"),
+            ("Tanggal Mulai", "Tanggal Macet"),
+            ("Tanggal Jatuh Tempo", "Sebab Macet"),
+            ("Valuta", "Tunggakan"),
+            ("Nilai Dalam Mata Uang Asal", "Kondisi"),
+            ("Suku Bunga/Imbalan", "Tanggal Kondisi"),
+        ],
+    },
+}
+
+def split_label_pairs(df, splits):
+    """Memisah kolom yang berisi dua label sekaligus, per kolom bukan per baris.
+
+    Untuk setiap (kolom, penanda), teks sebelum kemunculan pertama penanda
+    tetap di kolom, teks sesudahnya masuk kolom baru bernama penanda. Nilai
+    kosong tetap kosong di kedua kolom, baris tanpa penanda kosong di kolom baru.
+    """
+    for column, marker in splits:
+        if column not in df.columns:
+            continue
+        parts = df[column].str.split(marker, n=1, expand=True, regex=False)
+        df[column] = parts[0]
+        df[marker] = parts[1] if 1 in parts.columns else None
+    return df
+
+def _compile_label_pattern(sections):
+    """Satu regex alternation untuk semua label field, dicocokkan di awal baris.
+
+    Label terpanjang didahulukan supaya label yang juga awalan label lain
+    tidak memotong label yang lebih panjang.
+    """
+    labels = {label for spec in sections.values() for label, _, _ in spec["fields"]}
+    labels.add("Keterangan")
+    alternation = "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+    return re.compile(rf"\s*({alternation})")
+
+# Pengklasifikasi label baris: satu kali match per baris menggantikan rantai elif "X" in line
+LABEL_PATTERN = _compile_label_pattern(FACILITY_SECTIONS)
+
+# Dispatch label -> (label lain yang wajib ada, extractor) untuk setiap jenis fasilitas
+FIELD_DISPATCH = {
+    name: {label: (requires, extract) for label, requires, extract in spec["fields"]}
+    for name, spec in FACILITY_SECTIONS.items()
+}
+
+def _baris_ke_depan(halaman, h, j, k):
+    """Baris ke-k setelah baris j di halaman h, boleh menyeberang ke halaman berikutnya"""
+    j += k
+    while h < len(halaman) and j >= len(halaman[h][0]):
+        j -= len(halaman[h][0])
+        h += 1
+    return halaman[h][0][j] if h < len(halaman) else None
+
+def scan_facility_lines(combined_data, sections=None):
+    """Memindai setiap baris teks halaman satu kali untuk semua jenis fasilitas.
+
+    Setiap halaman hanya dilihat oleh jenis fasilitas yang marker-nya (atau
+    PENANDA_HALAMAN_UMUM) ada di halaman itu, sama seperti filter per jenis
+    sebelumnya. Label field setiap baris dikenali sekali lewat LABEL_PATTERN
+    (label harus berada di awal baris) lalu diteruskan ke extractor milik
+    jenis fasilitas yang bersangkutan. Konteks debitur (Nama Group dan Nama
+    Debitur) dibaca sekali lalu dibagikan ke semua jenis. Mengembalikan dict nama jenis -> list
+    record per fasilitas.
+    """
+    names = list(FACILITY_SECTIONS) if sections is None else list(sections)
+    specs = [FACILITY_SECTIONS[name] for name in names]
+    dispatch = [FIELD_DISPATCH[name] for name in names]
+    states = [
+        {"data_dict": dict.fromkeys(spec["columns"]), "data_list": [], "prev_line": None}
+        for spec in specs
+    ]
+
+    # Pilih halaman & jenis fasilitas yang memindainya, lalu split baris sekali saja
+    halaman = []
+    for text in combined_data[0]:
+        if not isinstance(text, str):
+            continue
+        umum = PENANDA_HALAMAN_UMUM in text
+        visible = [k for k, spec in enumerate(specs) if umum or spec["marker"] in text]
+        if visible:
+            halaman.append((text.split('\n'), visible))
+
+    for h, (lines, visible) in enumerate(halaman):
+        for j, line in enumerate(lines):
+            if line.strip() == "Nomor Laporan":  # Hanya baris yang persis "Nomor Laporan"
+                group_line = _baris_ke_depan(halaman, h, j, 2)
+                if group_line is not None:
+                    nama_group = " ".join(group_line.strip().split()[:3])
+                    for k in visible:
+                        states[k]["data_dict"]["Nama Group"] = nama_group
+
+            # Baris == "Penyajian informasi debitur pada Sistem Layanan Informasi"
+            if "Penyajian informasi debitur pada Sistem Layanan Informasi" in line:
+                # Ambil Baris Ke-4 Setelah Teks Tersebut, 5 Kata Pertama
+                nama_line = _baris_ke_depan(halaman, h, j, 3)
+                if nama_line is not None:
+                    nama_debitur = " ".join(nama_line.strip().split()[:5])
+                    for k in visible:
+                        states[k]["data_dict"]["Nama Debitur"] = nama_debitur
+
+            # NAMA PELAPOR/BANK & BAKI DEBET
+            bank_line = " - " in line and "Rp" in line
+            if bank_line:
+                bank_part = line.split("Rp")[0].strip()
+                os_value = line.split("Rp")[1].strip().split(" ")[0]
+            else:
+                match = LABEL_PATTERN.match(line)
+                label = match.group(1) if match else None
+
+            for k in visible:
+                spec = specs[k]
+                state = states[k]
+                data_dict = state["data_dict"]
+                prev_line = state["prev_line"]
+                state["prev_line"] = line
+
+                if bank_line:
+                    if spec["bank_after"] is None or (prev_line is not None and spec["bank_after"] in prev_line):
+                        data_dict["BANK"] = bank_part
+                    data_dict["Baki Debet"] = os_value
+                    continue
+                if label is None:
+                    continue
+
+                field = dispatch[k].get(label)
+                if field is not None:
+                    requires, extract = field
+                    if requires is None or requires in line:
+                        data_dict.update(extract(line))
+
+                # KETERANGAN: akhir satu fasilitas, simpan record
+                elif (label == "Keterangan" and prev_line is not None
+                        and any(penanda in prev_line for penanda in spec["keterangan_after"])):
+                    data_dict["Keterangan"] = line.split("Keterangan")[1].strip()
+                    state["data_list"].append(data_dict.copy())
+
+    return {name: state["data_list"] for name, state in zip(names, states)}
+
+def process_all_facility_data(combined_data):
+    """Memproses kelima jenis fasilitas dengan satu kali pemindaian baris"""
+    records = scan_facility_lines(combined_data)
+    storage = storage_of(combined_data[0])
+    return (
+        finalize_kredit_data(records["kredit"], storage),
+        finalize_lc_data(records["lc"], storage),
+        finalize_garansi_data(records["garansi"], storage),
+        finalize_surat_data(records["surat"], storage),
+        finalize_fasilitas_data(records["fasilitas"], storage),
+    )
+
+def process_kredit_data(combined_data):
+    """Memproses data kredit dari data gabungan"""
+    return finalize_kredit_data(scan_facility_lines(combined_data, ["kredit"])["kredit"], storage_of(combined_data[0]))
+
+def finalize_kredit_data(data_list, string_storage=DEFAULT_STRING_STORAGE):
+    """Membentuk DataFrame kredit dari record hasil scan_facility_lines"""
+    kredit = to_string_storage(pd.DataFrame(data_list), string_storage)
+    
+    if not kredit.empty:
+        kredit = kredit.dropna(subset=['Jenis Kredit/Pembiayaan'])
+
+        # Split kolom-kolom yang perlu dipisah
+        kredit = split_label_pairs(kredit, FACILITY_SECTIONS["kredit"]["splits"])
+
+        # Filter data
+        if 'Keterangan' in kredit.columns:
+            kredit = kredit[~kredit['Keterangan'].str.contains('Tgl Penilaian Penilai Independen|Garansi|L/C', na=False, case=False)]
+
+        # Cleaning persentase
+        if 'Suku Bunga/Imbalan' in kredit.columns:
+            kredit['Suku Bunga/Imbalan'] = parse_percentage(kredit['Suku Bunga/Imbalan'])
+
+        # Standardisasi nilai
+        if 'Jenis Kredit/Pembiayaan' in kredit.columns:
+            kredit['Jenis Kredit/Pembiayaan'] = kredit['Jenis Kredit/Pembiayaan'].str.strip().replace(
+                {
+                    'Kredit atau Pembiayaan untuk': 'Kredit atau Pembiayaan untuk Pembayaran Bersama (Sindikasi)',
+                    'Kartu Kredit atau Kartu Pembiayaan': 'Kartu Kredit atau Kartu Pembiayaan Syariah',
+                    'Kredit atau Pembiayaan kepada Pihak': 'Kredit atau Pembiayaan kepada Pihak Ketiga Melalui Lembaga Lain Secara Channeling',
+                    'Kredit atau Pembiayaan kepada Non-UMKM': 'Kredit atau Pembiayaan kepada Non-UMKM melalui Lembaga Lain Secara Executing',
+                    'Kredit atau Pembiayaan kepada UMKM': 'Kredit atau Pembiayaan kepada UMKM Melalui Lembaga Lain Secara Executing',
+                    'Kredit/ Pembiayaan Kepada Non-UMKM': 'Kredit atau Pembiayaan kepada Non-UMKM melalui Lembaga Lain Secara Executing',
+                    'Kredit/Pembiayaan Dalam Rangka': 'Kredit atau Pembiayaan Dalam Rangka Pembiayaan Bersama (Sindikasi)',
+                },
+                regex=False)
+
+        if 'Kategori Debitur' in kredit.columns:
+            kredit['Kategori Debitur'] = kredit['Kategori Debitur'].str.strip().replace(
+                {'Bukan Debitur Usaha Mikro, Kecil, dan': 'Bukan Debitur Usaha Mikro, Kecil, dan Menengah'},
+                regex=False)
+
+        if 'Sektor Ekonomi' in kredit.columns:
+            kredit['Sektor Ekonomi'] = kredit['Sektor Ekonomi'].str.strip().replace({
+                'Industri Rokok dan Produk Tembakau': 'Industri Rokok dan Produk Tembakau Lainnya',
+                'Industri Penggilingan Beras dan Jagung': 'Industri Penggilingan Beras dan Jagung dan Industri Tepung Beras dan Jagung',
+                'Industri Penggilingan Padi dan': 'Industri Penggilingan Padi dan Penyosohan Beras',
+                'Perdagangan Besar Mesin-mesin, Suku': 'Perdagangan Besar Mesin-mesin, Suku Cadang dan Perlengkapannya',
+                'Perdagangan Eceran Mesin-mesin': 'Perdagangan Eceran Mesin-mesin (Kecuali Mobil dan Sepeda Motor) dan Suku Cadang, termasuk Alat-alat Tranportasi',
+                'Perdagangan Besar Mesin, Peralatan': 'Perdagangan Besar Mesin, Peralatan dan Perlengkapannya',
+                'Perdagangan Impor Suku Cadang': 'Perdagangan Impor Suku Cadang Mesin-mesin, Suku Cadang dan Perlengkapan Lain',
+                'Rumah Tangga Untuk Pemilikan Mobil': 'Rumah Tangga Untuk Pemilikian Mobil Roda Empat',
+            }, regex=False)
+
+        if 'Kredit Program Pemerintah' in kredit.columns:
+            kredit['Kredit Program Pemerintah'] = kredit['Kredit Program Pemerintah'].str.strip().replace({
+                'Kredit yang bukan merupakan kredit/': 'Kredit yang bukan merupakan kredit/pembiayaan dalam rangka program pemerintah'
+            }, regex=False)
+
+        # Tambahkan kategori dan rename kolom
+        kredit['Kategori'] = 'Kredit/Pembiayaan'
+        
+        finalkredit = kredit.rename(columns={
+            "Baki Debet": "Baki Debet/Nominal",
+            "No Rekening": "No Rek/LC/Surat",
+            "Jenis Kredit/Pembiayaan": "Jenis Kredit/LC/Garansi/Surat/Fasilitas",
+            "Tanggal Mulai": "Tanggal Mulai/Terbit",
+            "Tanggal Macet": "Tanggal Macet/Wanprestasi",
+            "Realisasi/Pencairan Bulan Berjalan": "Nilai Perolehan/Jaminan/Realisasi",
+            "Jenis Penggunaan": "Tujuan/Jenis Penggunaan",
+            "Nilai Proyek": "Nilai Pasar/Proyek",
+            "Nilai dalam Mata Uang Asal": "Nilai Dalam Mata Uang Asal",
+        })
+        
+        return finalkredit
+    else:
+        return pd.DataFrame()
+
+def process_lc_data(combined_data):
+    """Memproses data LC Irrecovable dari data gabungan"""
+    return finalize_lc_data(scan_facility_lines(combined_data, ["lc"])["lc"], storage_of(combined_data[0]))
+
+def finalize_lc_data(data_list, string_storage=DEFAULT_STRING_STORAGE):
+    """Membentuk DataFrame L/C dari record hasil scan_facility_lines"""
+    lc = to_string_storage(pd.DataFrame(data_list), string_storage)
+
+    if 'Jenis L/C' in lc.columns:
+        lc = lc.dropna(subset=['Jenis L/C'])
+    else:
+        lc['Jenis L/C'] = pd.NA
+
+    # KOLOM JENIS L/C & VALUTA, dst.
+    if not lc.empty:
+        lc = split_label_pairs(lc, FACILITY_SECTIONS["lc"]["splits"])
+
+    if not lc.empty and 'Keterangan' in lc.columns:
+        lc = lc[~lc['Keterangan'].str.contains('Tgl Penilaian Penilai Independen', na=False)]
+
+    lc['Kategori'] = 'Irrecovable L/C'
+    # RENAME NAMA KOLOM
+    finallc = lc.rename(columns={
+        "Baki Debet": "Baki Debet/Nominal",
+        "No L/C": "No Rek/LC/Surat",
+        "Jenis L/C": "Jenis Kredit/LC/Garansi/Surat/Fasilitas",
+        "Tanggal Keluar": "Tanggal Mulai/Terbit",
+        "Tanggal Wan Prestasi": "Tanggal Macet/Wanprestasi",
+        "Setoran Jaminan": "Nilai Perolehan/Jaminan/Realisasi",
+        "Tujuan L/C": "Tujuan/Jenis Penggunaan",
+    })
+    
+    return finallc
+
+def process_garansi_data(combined_data):
+    """Memproses data Garansi dari data gabungan"""
+    return finalize_garansi_data(scan_facility_lines(combined_data, ["garansi"])["garansi"], storage_of(combined_data[0]))
+
+def finalize_garansi_data(data_list, string_storage=DEFAULT_STRING_STORAGE):
+    """Membentuk DataFrame Garansi dari record hasil scan_facility_lines"""
+    garansi = to_string_storage(pd.DataFrame(data_list), string_storage)
+
+    if 'Jenis Garansi' in garansi.columns:
+        garansi = garansi.dropna(subset=['Jenis Garansi'])
+    else:
+        garansi['Jenis Garansi'] = pd.NA
+
+    if not garansi.empty:
+        garansi = split_label_pairs(garansi, FACILITY_SECTIONS["garansi"]["splits"])
+
+    if not garansi.empty and 'Keterangan' in garansi.columns:
+        garansi = garansi[~garansi['Keterangan'].str.contains('Tgl Penilaian Penilai Independen', na=False)]
+
+    garansi['Kategori'] = 'Garansi'
+    finalgaransi = garansi.rename(columns={
+        "Baki Debet": "Baki Debet/Nominal",
+        "No Rekening": "No Rek/LC/Surat",
+        "Jenis Garansi": "Jenis Kredit/LC/Garansi/Surat/Fasilitas",
+        "Tanggal Diterbitkan": "Tanggal Mulai/Terbit",
+        "Tanggal Wan Prestasi": "Tanggal Macet/Wanprestasi",
+        "Setoran Jaminan": "Nilai Perolehan/Jaminan/Realisasi",
+        "Tujuan Garansi": "Tujuan/Jenis Penggunaan",
+    })
+    
+    return finalgaransi
+
+def process_surat_data(combined_data):
+    """Memproses data Surat Berharga dari data gabungan"""
+    return finalize_surat_data(scan_facility_lines(combined_data, ["surat"])["surat"], storage_of(combined_data[0]))
+
+def finalize_surat_data(data_list, string_storage=DEFAULT_STRING_STORAGE):
+    """Membentuk DataFrame Surat Berharga dari record hasil scan_facility_lines"""
+    surat = to_string_storage(pd.DataFrame(data_list), string_storage)
+
+    if 'Jenis Surat Berharga' in surat.columns:
+        surat = surat.dropna(subset=['Jenis Surat Berharga'])
+    else:
+        surat['Jenis Surat Berharga'] = pd.NA
+
+    if not surat.empty:
+        surat = split_label_pairs(surat, FACILITY_SECTIONS["surat"]["splits"])
+
+    # Cleaning persentase
+    if not surat.empty and 'Suku Bunga/Imbalan' in surat.columns:
+        surat['Suku Bunga/Imbalan'] = parse_percentage(surat['Suku Bunga/Imbalan'])
+
+    if not surat.empty and 'Keterangan' in surat.columns:
+        surat = surat[~surat['Keterangan'].str.contains('Tgl Penilaian Penilai Independen', na=False)]
+
+    surat['Kategori'] = 'Surat Berharga'
+    # RENAME NAMA KOLOM
+    finalsurat = surat.rename(columns={
+        "Baki Debet": "Baki Debet/Nominal",
+        "No Surat Berharga": "No Rek/LC/Surat",
+        "Jenis Surat Berharga": "Jenis Kredit/LC/Garansi/Surat/Fasilitas",
+        "Tanggal Terbit": "Tanggal Mulai/Terbit",
+        "Tanggal Macet": "Tanggal Macet/Wanprestasi",
+        "Kode Valuta": "Valuta",
+        "Nilai Perolehan": "Nilai Perolehan/Jaminan/Realisasi",
+        "Tunggakan": "Tunggakan Pokok",
+        "Tujuan Kepemilikan": "Tujuan/Jenis Penggunaan",
+        "Nilai Pasar": "Nilai Pasar/Proyek",
+    })
+    
+    return finalsurat
+
+def process_fasilitas_data(combined_data):
+    """Memproses data Fasilitas Lain dari data gabungan"""
+    return finalize_fasilitas_data(scan_facility_lines(combined_data, ["fasilitas"])["fasilitas"], storage_of(combined_data[0]))
+
+def finalize_fasilitas_data(data_list, string_storage=DEFAULT_STRING_STORAGE):
+    """Membentuk DataFrame Fasilitas Lain dari record hasil scan_facility_lines"""
+    fasilitas = to_string_storage(pd.DataFrame(data_list), string_storage)
+
+    if 'Jenis Fasilitas' in fasilitas.columns:
+        fasilitas = fasilitas.dropna(subset=['Jenis Fasilitas'])
+    else:
+        fasilitas['Jenis Fasilitas'] = pd.NA
+
+    if not fasilitas.empty:
+        fasilitas = split_label_pairs(fasilitas, FACILITY_SECTIONS["fasilitas"]["splits"])
+
+    # Cleaning persentase
+    if not fasilitas.empty and 'Suku Bunga/Imbalan' in fasilitas.columns:
+        fasilitas['Suku Bunga/Imbalan'] = parse_percentage(fasilitas['Suku Bunga/Imbalan'])
+
+    if not fasilitas.empty and 'Keterangan' in fasilitas.columns:
+        fasilitas = fasilitas[~fasilitas['Keterangan'].str.contains('Tgl Penilaian Penilai Independen', na=False)]
+
+    fasilitas['Kategori'] = 'Fasilitas Lain'
+    finalfasilitas = fasilitas.rename(columns={
+        "Baki Debet": "Baki Debet/Nominal",
+        "No Rekening": "No Rek/LC/Surat",
+        "Jenis Fasilitas": "Jenis Kredit/LC/Garansi/Surat/Fasilitas",
+        "Tanggal Mulai": "Tanggal Mulai/Terbit",
+        "Tanggal Macet": "Tanggal Macet/Wanprestasi",
+        "Nilai Perolehan": "Nilai Perolehan/Jaminan/Realisasi",
+        "Tunggakan": "Tunggakan Pokok",
+    })
+    
+    return finalfasilitas
+
+
+@functools.lru_cache(maxsize=4)
+def get_bank_index(path, signature):
+    """BankIndex yang dipakai bersama (semua sesi aplikasi); signature (ukuran, mtime) membuat cache ikut basi saat file berubah"""
+    return load_bank_index(path)
+
+def load_kodebank_index():
+    """BankIndex tabel kode bank, None (dengan peringatan) jika file tidak ada atau gagal dimuat"""
+    if not os.path.exists(KODEBANK_PATH):
+        report("warning", "⚠️ File kode bank tidak ditemukan, melanjutkan tanpa pemrosesan bank")
+        return None
+    try:
+        return get_bank_index(KODEBANK_PATH, file_signature(KODEBANK_PATH))
+    except Exception as e:
+        report("warning", f"⚠️ Gagal memproses data bank: {str(e)}")
+        return None
+
+def combine_and_clean_data(finalkredit, finallc, finalgaransi, finalsurat, finalfasilitas, compact=False,
+                           string_storage=DEFAULT_STRING_STORAGE, engine=DEFAULT_COMBINE_ENGINE):
+    """Menggabungkan dan membersihkan semua data
+
+    compact=True menyimpan hasil dengan dtype hemat memori (lihat compact_dtypes).
+    string_storage juga dipakai untuk kolom teks yang ditambahkan di tahap ini.
+    engine="polars" menjalankan tahap ini dengan combine_and_clean_polars.
+    """
+    
+    # GABUNG SEMUA DATA
+    report("info", "🔄 Menggabungkan semua data...")
+    Gabungan1 = [finalkredit, finallc, finalgaransi, finalsurat, finalfasilitas]
+
+    if engine == "polars":
+        report("info", "⚡ Memproses dengan engine Polars...")
+        finaldata = combine_and_clean_polars(Gabungan1, load_kodebank_index())
+        return finish_final_data(to_string_storage(finaldata, string_storage), compact)
+    if engine != "pandas":
+        raise ValueError(f"Engine tidak dikenal: {engine!r}")
+
+    Gabungan2 = pd.concat(Gabungan1, axis=0, ignore_index=True, sort=False)
+    
+    report("success", f"✅ Data berhasil digabungkan. Total {len(Gabungan2)} baris")
+
+    # Daftar kolom yang ingin diambil (lihat OUTPUT_SCHEMA)
+    kolom_dipilih = list(OUTPUT_SCHEMA)
+
+    # Ambil hanya kolom yang ada di DataFrame
+    kolom_tersedia = [kol for kol in kolom_dipilih if kol in Gabungan2.columns]
+    
+    # Buat DataFrame baru hanya dengan kolom yang tersedia
+    Gabungan3 = Gabungan2[kolom_tersedia]
+
+    # PROSES BANK DAN CABANG
+    report("info", "🏦 Memproses data bank dan cabang...")
+    # Load kode bank (asumsi file ada di direktori yang sama)
+    bank_index = load_kodebank_index()
+    if bank_index is not None:
+        try:
+            if not Gabungan3.empty and 'BANK' in Gabungan3.columns:
+                # BANK, CABANG, KODE BANK & NAMA BANK sekaligus, per nilai BANK unik
+                Gabungan3[RESOLVED_COLUMNS] = bank_index.resolve(Gabungan3['BANK'])
+
+            report("success", "✅ Data bank berhasil diproses")
+        except Exception as e:
+            report("warning", f"⚠️ Gagal memproses data bank: {str(e)}")
+
+    # Kolom teks yang baru ditambahkan (Kategori, hasil bank) ikut storage string pipeline
+    Gabungan3 = to_string_storage(Gabungan3, string_storage)
+
+    # CLEANING NAMA DEBITUR DAN GROUP
+    if not Gabungan3.empty and 'Nama Debitur' in Gabungan3.columns and 'Nama Group' in Gabungan3.columns:
+        Gabungan3["Nama Debitur"] = (
+            Gabungan3["Nama Debitur"]
+            .str.replace(r'NIK\s?/.*|NPWP\s?/.*', '', regex=True)
+            .str.replace(r'\s*\d+.*$', '', regex=True)
+            .str.replace(r'(LAKI|PEREMPUAN).*$', '', regex=True)
+            .str.strip()
+        )
+
+        Gabungan3["Nama Group"] = (
+            Gabungan3["Nama Group"]
+            .str.replace(r'(?i)(posisi|laki|perempuan).*$', '', regex=True)
+            .str.strip()
+        )
+
+    # KONVERSI TIPE DATA: nominal, persentase, tanggal & frekuensi sesuai OUTPUT_SCHEMA
+    Gabungan3 = cast_to_schema(Gabungan3)
+
+    sort_columns = []
+    
+    if 'Nama Debitur' in Gabungan3.columns:
+        sort_columns.append('Nama Debitur')
+    
+    if 'Nama Group' in Gabungan3.columns:
+        sort_columns.append('Nama Group')
+
+    # Jika kedua kolom ada, lakukan sorting
+    if sort_columns:
+        Gabungan3 = Gabungan3.sort_values(by=sort_columns, ascending=True)
+        logger.debug("Data telah di-sort berdasarkan: %s", sort_columns)
+    else:
+        logger.debug("Kolom 'Nama Debitur' atau 'Nama Group' tidak ditemukan untuk sorting")
+
+    # FINAL SELECTION
+    kolom_tersedia_final = [kol for kol in kolom_dipilih if kol in Gabungan3.columns]
+    finaldata = Gabungan3[kolom_tersedia_final]
+
+    return finish_final_data(finaldata, compact)
+
+def finish_final_data(finaldata, compact=False):
+    """Laporan memori data final, dengan compact_dtypes jika compact=True"""
+    # LAPORAN MEMORI
+    memori = memory_report(finaldata)
+    if compact:
+        finaldata = compact_dtypes(finaldata.copy())
+        memori_awal, memori = memori, memory_report(finaldata)
+        report(
+            "info",
+            f"📦 Memori data: {memori['bytes'].sum() / 1024 / 1024:.2f} MB "
+            f"(sebelum mode hemat memori {memori_awal['bytes'].sum() / 1024 / 1024:.2f} MB)"
+        )
+    else:
+        report("info", f"📦 Memori data: {memori['bytes'].sum() / 1024 / 1024:.2f} MB")
+    report_table("📦 Rincian memori per kolom", memori)
+    
+    report("success", f"🎉 Cleaning data selesai! Final data shape: {finaldata.shape}")
+    
+    return finaldata
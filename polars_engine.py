@@ -0,0 +1,134 @@
+"""Engine Polars untuk tahap gabung & cleaning data SLIK.
+
+Alternatif combine_and_clean_data (engine pandas) yang menjalankan operasi
+kolom secara multi-thread. Kolom dan nilai hasilnya sama dengan engine pandas;
+parsing tanggal tetap memakai parse_unique_dates, tetapi hanya untuk nilai unik.
+
+Polars (dan pyarrow untuk konversi dari/ke pandas) bersifat opsional dan baru
+diimpor saat engine ini dipakai. Modul ini tidak mengimpor streamlit supaya
+bisa dipakai di luar aplikasi.
+"""
+import numpy as np
+import pandas as pd
+
+from bank_reference import RESOLVED_COLUMNS
+from cleaning import OUTPUT_SCHEMA, parse_unique_dates
+
+# Engine tahap gabung & cleaning yang tersedia
+COMBINE_ENGINES = ("pandas", "polars")
+DEFAULT_COMBINE_ENGINE = "pandas"
+
+# Kolom bantu urutan baris asal (index hasil pandas setelah sorting)
+_ROW_INDEX = "__baris__"
+
+
+def _polars():
+    try:
+        import polars
+        import pyarrow  # noqa: F401  (dipakai polars untuk konversi pandas)
+    except ImportError as e:
+        raise ImportError("Engine polars membutuhkan paket polars dan pyarrow (pip install polars pyarrow)") from e
+    return polars
+
+
+def _to_number(pl, text):
+    """Sama dengan pd.to_numeric(errors="coerce"): Int64 jika semua nilai bilangan bulat, selain itu Float64"""
+    text = text.str.strip_chars()
+    as_int = text.cast(pl.Int64, strict=False)
+    if as_int.null_count() == 0:
+        return as_int
+    return text.cast(pl.Float64, strict=False)
+
+
+def _numeric_columns(pl, data, schema):
+    """Kolom amount, rate dan count yang sudah dikonversi (lihat cast_to_schema)"""
+    converted = []
+    for col in data.columns:
+        kind = schema.get(col)
+        text = data[col].cast(pl.String)
+        if kind == "amount":
+            # parse_amount: "Rp" dibuang, bagian setelah koma dibuang, titik ribuan dihapus, gagal -> 0
+            text = text.str.replace_all("Rp", "", literal=True).str.splitn(",", 2).struct.field("field_0")
+            values = _to_number(pl, text.str.replace_all(".", "", literal=True))
+            if values.dtype == pl.Float64:
+                values = values.fill_nan(0).fill_null(0)
+            converted.append(values.alias(col))
+        elif kind == "rate":
+            # parse_percentage(scale=100): nilai kosong tetap kosong. Pembagi berupa Series, bukan
+            # skalar: polars mengganti "/ 100" dengan "* 0.01" sehingga 17.87 menjadi 0.17870000000000003
+            text = text.str.replace_all("%", "", literal=True).str.strip_chars()
+            values = text.cast(pl.Float64, strict=False)
+            converted.append((values / pl.repeat(100.0, values.len(), eager=True)).alias(col))
+        elif kind == "count":
+            converted.append(_to_number(pl, text).alias(col))
+    return converted
+
+
+def _date_columns(pl, data, schema):
+    """Ekspresi konversi kolom tanggal; setiap nilai unik semua kolom di-parse sekali"""
+    columns = [col for col in data.columns if schema.get(col) == "date"]
+    if not columns or data.height == 0:
+        return []
+    uniques = pl.concat([data[col].cast(pl.String) for col in columns]).drop_nulls().unique()
+    parsed = pl.Series(parse_unique_dates(uniques.to_numpy()).to_numpy()).cast(pl.Datetime("ns"))
+    return [
+        pl.col(col).cast(pl.String).replace_strict(uniques, parsed, default=None, return_dtype=pl.Datetime("ns"))
+        for col in columns
+    ]
+
+
+def combine_and_clean_polars(frames, bank_index=None, schema=OUTPUT_SCHEMA):
+    """Menggabungkan dan membersihkan DataFrame fasilitas dengan Polars.
+
+    Langkahnya sama dengan combine_and_clean_data: gabung, pilih kolom schema,
+    pencocokan bank (bank_index, None = dilewati), cleaning nama, konversi tipe
+    sesuai schema, lalu sorting per Nama Debitur dan Nama Group. Hasilnya
+    DataFrame pandas dengan index baris asal seperti hasil engine pandas.
+    """
+    pl = _polars()
+    parts = [pl.from_pandas(frame) for frame in frames if len(frame.columns)]
+    if not parts:
+        return pd.DataFrame()
+    data = pl.concat(parts, how="diagonal_relaxed").with_row_index(_ROW_INDEX)
+    data = data.select([_ROW_INDEX] + [col for col in schema if col in data.columns])
+
+    # PROSES BANK DAN CABANG: dicocokkan per nilai BANK unik, hasilnya disebar lewat replace_strict
+    if bank_index is not None and data.height and "BANK" in data.columns:
+        banks = data["BANK"].cast(pl.String).drop_nulls().unique(maintain_order=True)
+        resolved = pl.from_pandas(bank_index.resolve(banks.to_pandas()).reset_index(drop=True))
+        bank = pl.col("BANK").cast(pl.String)
+        data = data.with_columns([
+            bank.replace_strict(banks, resolved[col].cast(pl.String), default="" if col == "CABANG" else None,
+                                return_dtype=pl.String).alias(col)
+            for col in RESOLVED_COLUMNS
+        ])
+
+    # CLEANING NAMA DEBITUR DAN GROUP
+    if data.height and "Nama Debitur" in data.columns and "Nama Group" in data.columns:
+        data = data.with_columns(
+            pl.col("Nama Debitur").cast(pl.String)
+            .str.replace_all(r"NIK\s?/.*|NPWP\s?/.*", "")
+            .str.replace_all(r"\s*\d+.*$", "")
+            .str.replace_all(r"(LAKI|PEREMPUAN).*$", "")
+            .str.strip_chars(),
+            pl.col("Nama Group").cast(pl.String)
+            .str.replace_all(r"(?i)(posisi|laki|perempuan).*$", "")
+            .str.strip_chars(),
+        )
+
+    # KONVERSI TIPE DATA sesuai schema
+    data = data.with_columns(_numeric_columns(pl, data, schema) + _date_columns(pl, data, schema))
+
+    # SORTING: stabil dan nilai kosong di akhir, seperti sort_values
+    sort_columns = [col for col in ("Nama Debitur", "Nama Group") if col in data.columns]
+    if sort_columns:
+        data = data.sort(sort_columns, nulls_last=True, maintain_order=True)
+
+    # FINAL SELECTION
+    result = data.select([_ROW_INDEX] + [col for col in schema if col in data.columns]).to_pandas()
+    result.index = pd.Index(result.pop(_ROW_INDEX).to_numpy(dtype="int64"))
+    # Nilai teks kosong ditandai NaN, seperti hasil pd.concat engine pandas
+    text_columns = [col for col in result.columns if result[col].dtype == object]
+    result[text_columns] = result[text_columns].where(result[text_columns].notna(), np.nan)
+    return result
+
@@ -0,0 +1,9 @@
+import pytest
+
+from sample_corpus import write_corpus
+
+
+@pytest.fixture(scope="session")
+def sample_pdfs(tmp_path_factory):
+    """Korpus PDF contoh (4 laporan) yang dipakai bersama semua test"""
+    return write_corpus(str(tmp_path_factory.mktemp("sample_pdfs")))
@@ -0,0 +1,189 @@
+"""Korpus contoh laporan SLIK sintetis untuk test (deterministik per seed).
+
+sample_reports menghasilkan teks halaman (list baris per halaman) yang bentuknya
+sama dengan hasil ekstraksi, write_pdf menuliskannya ke PDF dengan PyMuPDF.
+Tanpa file PDF biner di repo; PDF dibuat ulang di direktori sementara test.
+
+Bisa juga dijalankan langsung untuk membuat PDF contoh:
+    python tests/sample_corpus.py <direktori> [jumlah_file]
+"""
+import os
+import random
+import sys
+
+PAGE_MARKER = "Sistem Layanan Informasi Keuangan"
+
+BANKS = [
+    "002 - PT Bank Rakyat Indonesia (Persero) Kantor Cabang Jakarta",
+    "014 - PT Bank Central Asia Tbk KCU Sudirman",
+    "009 - PT Bank Negara Indonesia (Persero) Cabang Medan",
+    "250390 - PT Toyota Astra Financial Services Jakarta",
+    "999 - PT Bank Tidak Dikenal Cabang X",
+    "013 - PT Bank  Permata Tbk Cabang Bandung",
+]
+DEBITUR = ["PT MAJU JAYA ABADI", "BUDI SANTOSO", "CV SINAR TERANG", "PT ANEKA NIAGA"]
+MONTHS = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli", "Agustus",
+          "September", "Oktober", "November", "Desember"]
+RATES = ["9.50%", "11%", "7.25%", "17.87%", "5.5%", "12.33%"]
+
+
+class _Generator:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def date(self):
+        rng = self.rng
+        return f"{rng.randint(1, 28):02d} {rng.choice(MONTHS)} {rng.randint(2015, 2026)}"
+
+    def amount(self):
+        return f"Rp {self.rng.randint(0, 10**9):,}".replace(",", ".") + ",00"
+
+    def header(self, name, group):
+        return [PAGE_MARKER, "Nomor Laporan", "12345/IDEB/2024",
+                f"{group} Posisi Data Terakhir 2024", "Penyajian informasi debitur pada Sistem Layanan Informasi",
+                "Keuangan", "Nama Sesuai Identitas NIK / NPWP", f"{name} NPWP / 0123456789 LAKI-LAKI"]
+
+    def kredit(self):
+        rng, d, rp = self.rng, self.date, self.amount
+        return [
+            "Pelapor Cabang Baki Debet Tanggal Update", f"{rng.choice(BANKS)} {rp()} 01 Mei 2024",
+            f"No Rekening {rng.randint(10**6, 10**7)} Kualitas 1 - Lancar",
+            "Sifat Kredit/Pembiayaan Kredit/Pembiayaan Lainnya Jumlah Hari Tunggakan 0",
+            "Jenis Kredit/Pembiayaan Kredit atau Pembiayaan untuk Nilai Proyek " + rp(),
+            "Akad Kredit/Pembiayaan Konvensional Plafon Awal " + rp(),
+            "Frekuensi Perpanjangan Kredit/ 2 Plafon " + rp(),
+            "No Akad Awal 001/PK/2020 Realisasi/Pencairan Bulan Berjalan " + rp(),
+            f"Tanggal Akad Awal {d()} Nilai dalam Mata Uang Asal " + rp(),
+            "No Akad Akhir 002/PK/2021 Sebab Macet -",
+            f"Tanggal Akad Akhir {d()} Tanggal Macet -",
+            f"Tanggal Awal Kredit {d()} Tunggakan Pokok " + rp(),
+            f"Tanggal Mulai {d()} Tunggakan Bunga " + rp(),
+            f"Tanggal Jatuh Tempo {d()} Frekuensi Tunggakan 0",
+            "Kategori Debitur Bukan Debitur Usaha Mikro, Kecil, dan Denda " + rp(),
+            "Jenis Penggunaan Modal Kerja Frekuensi Restrukturisasi 0",
+            "Sektor Ekonomi Industri Rokok dan Produk Tembakau Tanggal Restrukturisasi Akhir -",
+            "Kredit Program Pemerintah Kredit yang bukan merupakan kredit/ Cara Restrukturisasi -",
+            "Kab/Kota Lokasi Proyek Kota Jakarta Selatan Kondisi Fasilitas Aktif",
+            f"Valuta IDR Tanggal Kondisi {d()}",
+            f"Suku Bunga/Imbalan {rng.choice(RATES)} Jenis Suku Bunga/Imbalan Floating",
+            rng.choice(["Keterangan -", "Keterangan Tgl Penilaian Penilai Independen", "Keterangan Refinancing"]),
+        ]
+
+    def lc(self):
+        rng, d, rp = self.rng, self.date, self.amount
+        return [
+            "Pelapor Cabang Baki Debet", f"{rng.choice(BANKS)} {rp()}",
+            f"No L/C LC{rng.randint(1000, 9999)} Kualitas 1 - Lancar",
+            "Jenis L/C Sight L/C Valuta USD", f"Tanggal Keluar {d()} Plafon " + rp(),
+            f"Tanggal Jatuh Tempo {d()} Tujuan L/C Impor", "No Akad Awal 01/LC Setoran Jaminan " + rp(),
+            f"Tanggal Akad Awal {d()} Tanggal Wan Prestasi -", "No Akad Akhir 02/LC Kondisi Fasilitas Aktif",
+            f"Tanggal Akad Akhir {d()} Tanggal Kondisi {d()}", "Bank Beneficiary Bank of China", "Keterangan -",
+        ]
+
+    def garansi(self):
+        rng, d, rp = self.rng, self.date, self.amount
+        return [
+            "Pelapor Cabang Baki Debet", f"{rng.choice(BANKS)} {rp()}",
+            f"No Rekening G{rng.randint(1000, 9999)} Kualitas 1 - Lancar",
+            "Jenis Garansi Bank Garansi Valuta IDR", f"Tanggal Diterbitkan {d()} Plafon " + rp(),
+            f"Tanggal Jatuh Tempo {d()} Tujuan Garansi Pelaksanaan", "No Akad Awal 01/BG Setoran Jaminan " + rp(),
+            f"Tanggal Akad Awal {d()} Tanggal Wan Prestasi -", "No Akad Akhir 02/BG Kondisi Fasilitas Aktif",
+            f"Tanggal Akad Akhir {d()} Tanggal Kondisi {d()}", "Nama Yang Dijamin PT Penerima Jaminan",
+            "Keterangan -",
+        ]
+
+    def surat(self):
+        rng, d, rp = self.rng, self.date, self.amount
+        return [
+            "Pelapor Cabang Baki Debet", f"{rng.choice(BANKS)} {rp()}",
+            f"No Surat Berharga SB{rng.randint(1000, 9999)} Kualitas 1 - Lancar",
+            "Jenis Surat Berharga Medium Term Notes Jumlah Hari Tunggakan 0",
+            "Sovereign Rate BBB Nilai Dalam Mata Uang Asal " + rp(),
+            "Listing Ya Nilai Pasar " + rp(), "Peringkat Surat Berharga idA Nilai Perolehan " + rp(),
+            "Tujuan Kepemilikan Dimiliki hingga jatuh tempo Tunggakan " + rp(),
+            f"Tanggal Terbit {d()} Tanggal Macet -", f"Tanggal Jatuh Tempo {d()} Sebab Macet -",
+            f"Suku Bunga/Imbalan {rng.choice(RATES)} Kondisi Fasilitas Aktif",
+            f"Kode Valuta IDR Tanggal Kondisi {d()}", "Keterangan -",
+        ]
+
+    def fasilitas(self):
+        rng, d, rp = self.rng, self.date, self.amount
+        return [
+            "Pelapor Cabang Baki Debet", f"{rng.choice(BANKS)} {rp()}",
+            f"No Rekening F{rng.randint(1000, 9999)} Kualitas 2 - Dalam Perhatian Khusus",
+            "Jenis Fasilitas Fasilitas Lainnya Jumlah Hari Tunggakan 3", f"Tanggal Mulai {d()} Tanggal Macet -",
+            f"Tanggal Jatuh Tempo {d()} Sebab Macet -", "Valuta IDR Tunggakan " + rp(),
+            "Nilai Dalam Mata Uang Asal " + rp() + " Kondisi Fasilitas Aktif",
+            f"Suku Bunga/Imbalan {rng.choice(RATES)} Tanggal Kondisi {d()}",
+            "Keterangan -",
+        ]
+
+    def report(self, max_lines=45):
+        rng = self.rng
+        name = rng.choice(DEBITUR)
+        blocks = [self.kredit] * 5 + [self.lc, self.garansi, self.surat, self.fasilitas]
+        pages = [self.header(name, f"GRUP {name.split()[-1]} HOLDING")]
+        current = []
+        for _ in range(rng.randint(5, 25)):
+            block = rng.choice(blocks)()
+            if len(current) + len(block) > max_lines:
+                pages.append(current)
+                current = []
+            current += block
+        pages.append(current)
+        return pages
+
+
+def sample_reports(n_reports=4, seed=1):
+    """n_reports laporan; setiap laporan berupa list halaman, setiap halaman list baris teks"""
+    generator = _Generator(seed)
+    return [generator.report() for _ in range(n_reports)]
+
+
+def page_texts(report):
+    """Teks per halaman seperti hasil extract_page_texts (spasi berurutan jadi satu)"""
+    return ["\n".join(" ".join(line.split()) for line in lines) for lines in report]
+
+
+def write_pdf(report, path, marker_color=(0, 0, 0), watermark=None):
+    """Menulis satu laporan ke PDF.
+
+    marker_color mengatur warna baris penanda halaman (PAGE_MARKER) di setiap
+    halaman; watermark "rotated" atau "diagonal" menambah teks overlay abu-abu
+    besar di atas isi halaman.
+    """
+    import pymupdf
+
+    doc = pymupdf.open()
+    for lines in report:
+        page = doc.new_page(width=595, height=842)
+        y = 30
+        for line in lines:
+            color = marker_color if line == PAGE_MARKER else (0, 0, 0)
+            page.insert_text((30, y), line, fontsize=8, color=color)
+            y += 11
+        if watermark == "rotated":
+            page.insert_text((200, 600), "RAHASIA RAHASIA", fontsize=40, color=(0.85, 0.85, 0.85), rotate=90)
+        elif watermark == "diagonal":
+            for k in range(3):
+                point = pymupdf.Point(60, 260 + 250 * k)
+                page.insert_text(point, "RAHASIA  SLIK  OJK", fontsize=36, color=(0.8, 0.8, 0.8),
+                                 morph=(point, pymupdf.Matrix(-30)))
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def write_corpus(directory, n_reports=4, seed=1, **kwargs):
+    """PDF untuk setiap laporan sample_reports; mengembalikan list path"""
+    os.makedirs(directory, exist_ok=True)
+    return [
+        write_pdf(report, os.path.join(directory, f"slik_{i:03d}.pdf"), **kwargs)
+        for i, report in enumerate(sample_reports(n_reports, seed))
+    ]
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "sample_pdfs"
+    for path in write_corpus(target, int(sys.argv[2]) if len(sys.argv) > 2 else 4):
+        print(path)
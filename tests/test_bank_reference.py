@@ -0,0 +1,112 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from bank_reference import KODEBANK_PATH, BankIndex, load_bank_index, sidecar_path
+
+KODEBANK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), KODEBANK_PATH)
+
+
+@pytest.fixture(scope="module")
+def kodebank():
+    return pd.read_excel(KODEBANK)
+
+
+def _resolve(index, text):
+    return index.resolve(pd.Series([text])).iloc[0]
+
+
+def _code(keterangan):
+    return int(keterangan.partition(" - ")[0])
+
+
+def test_fuzzy_never_crosses_bank_codes(kodebank):
+    # Leave-one-out: KETERANGAN yang dibuang dari tabel + nama cabang hanya boleh jatuh
+    # ke KETERANGAN dengan kode yang sama, atau tidak ter-resolve
+    for i, keterangan in kodebank["KETERANGAN"].items():
+        index = BankIndex(kodebank.drop(index=i))
+        text = keterangan + " KANTOR CABANG X"
+        if index.find(text) is not None:
+            continue
+        hasil = _resolve(index, text)
+        if pd.isna(hasil["BANK"]):
+            continue
+        assert int(hasil["KODE BANK"]) == _code(keterangan), text
+        assert not any(char.isdigit() for char in hasil["CABANG"]), (text, hasil["CABANG"])
+
+
+@pytest.mark.parametrize("dibuang, text, kode_salah", [
+    ("600845 - PT Bank Perekonomian Rakyat", "600845 - PT Bank Perekonomian Rakyat KANTOR CABANG X", "600826"),
+    ("456 - PT Bank Oke Indonesia d/h bank Andara",
+     "456 - PT Bank Oke Indonesia d/h bank Andara KANTOR CABANG X", "466"),
+])
+def test_near_identical_neighbour_with_other_code(kodebank, dibuang, text, kode_salah):
+    index = BankIndex(kodebank[kodebank["KETERANGAN"] != dibuang])
+    hasil = _resolve(index, text)
+    assert hasil["KODE BANK"] != kode_salah
+    assert pd.isna(hasil["BANK"]) or hasil["KODE BANK"] == dibuang.partition(" - ")[0]
+
+
+@pytest.fixture
+def small_index():
+    return BankIndex(pd.DataFrame({
+        "KETERANGAN": ["013 - PT Bank Permata Tbk", "014 - PT Bank Central Asia Tbk",
+                       "600089 - PT Bank Perekonomian Rakyat Hariarta"],
+        "NAMA BANK": ["PT Bank Permata Tbk", "PT Bank Central Asia Tbk",
+                      "PT Bank Perekonomian Rakyat Hariarta"],
+    }))
+
+
+def test_fuzzy_resolves_same_code_variants(small_index):
+    hasil = _resolve(small_index, "013 - PT Bank  Permata Tbk Cabang Bandung")
+    assert (hasil["BANK"], hasil["KODE BANK"], hasil["CABANG"]) == ("PT Bank Permata Tbk", "013", "Cabang Bandung")
+
+    hasil = _resolve(small_index, "600089 - PT Bank Perekonomian Rakyat Harianta KANTOR CABANG X")
+    assert hasil["KODE BANK"] == "600089"
+    assert hasil["CABANG"] == "KANTOR CABANG X"
+
+
+def test_fuzzy_leaves_other_codes_and_uncoded_text_unresolved(small_index):
+    for text in ["015 - PT Bank Permata Tbk Cabang Bandung", "PT Bank  Permata Tbk Cabang Bandung",
+                 "014 - PT Bank Permata Tbk Cabang Bandung"]:
+        hasil = _resolve(small_index, text)
+        assert pd.isna(hasil["BANK"]), text
+        assert hasil["CABANG"] == ""
+
+
+def _copy_kodebank(tmp_path):
+    target = tmp_path / "kodebank.xlsx"
+    target.write_bytes(open(KODEBANK, "rb").read())
+    return str(target)
+
+
+def test_sidecar_holds_plain_data(tmp_path, kodebank):
+    path = _copy_kodebank(tmp_path)
+    fresh = load_bank_index(path)
+    with open(sidecar_path(path), "rb") as f:
+        raw = f.read()
+    # Tidak ada referensi ke kelas/modul: unpickle tidak bergantung pada kode BankIndex
+    assert b"bank_reference" not in raw and b"BankIndex" not in raw
+
+    cached = load_bank_index(path)
+    teks = pd.Series(kodebank["KETERANGAN"].head(50) + " KANTOR CABANG X")
+    pd.testing.assert_frame_equal(cached.resolve(teks), fresh.resolve(teks))
+    pd.testing.assert_frame_equal(cached.resolve(teks), BankIndex(kodebank).resolve(teks))
+
+
+def test_sidecar_from_other_code_is_rebuilt(tmp_path, kodebank):
+    path = _copy_kodebank(tmp_path)
+    load_bank_index(path)
+    with open(sidecar_path(path), "rb") as f:
+        sidecar = pickle.load(f)
+    sidecar["code"] = "kode-lama"
+    sidecar["index"] = dict(sidecar["index"], keterangan=[], _goto=[{}], _fail=[0], _best=[None])
+    with open(sidecar_path(path), "wb") as f:
+        pickle.dump(sidecar, f)
+
+    index = load_bank_index(path)
+    assert index.keterangan == BankIndex(kodebank).keterangan
+    with open(sidecar_path(path), "rb") as f:
+        assert pickle.load(f)["code"] != "kode-lama"
@@ -0,0 +1,113 @@
+import gzip
+import os
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import batch_convert
+from batch_convert import find_pdfs, main, output_format, write_output
+
+pytest.importorskip("pymupdf")
+
+
+@pytest.fixture(autouse=True)
+def no_archive(monkeypatch):
+    monkeypatch.delenv("SLIK_ARCHIVE_PATH", raising=False)
+
+
+@pytest.fixture
+def pdf_dir(tmp_path, sample_pdfs):
+    """Salinan korpus contoh, dengan satu PDF di subdirektori dan satu file bukan PDF"""
+    directory = tmp_path / "laporan"
+    (directory / "sub").mkdir(parents=True)
+    for path in sample_pdfs[:-1]:
+        shutil.copy(path, directory)
+    shutil.copy(sample_pdfs[-1], directory / "sub")
+    (directory / "catatan.txt").write_text("bukan pdf")
+    return directory
+
+
+def test_find_pdfs(pdf_dir):
+    top = sorted(str(pdf_dir / name) for name in os.listdir(pdf_dir) if name.endswith(".pdf"))
+    assert find_pdfs([str(pdf_dir)]) == top
+    assert len(find_pdfs([str(pdf_dir)], recursive=True)) == len(top) + 1
+    assert find_pdfs([str(pdf_dir / "*.pdf")]) == top
+    # File eksplisit dan duplikat: urutan input dipertahankan, tanpa duplikat
+    assert find_pdfs([top[1], str(pdf_dir), top[0]]) == [top[1]] + [path for path in top if path != top[1]]
+    assert find_pdfs([str(pdf_dir / "catatan.txt"), str(pdf_dir / "tidak-ada.pdf")]) == []
+
+
+@pytest.mark.parametrize("output, fmt, expected", [
+    ("hasil.xlsx", None, "xlsx"),
+    ("hasil.parquet", None, "parquet"),
+    ("hasil.arrow", None, "arrow"),
+    ("HASIL.CSV.GZ", None, "csv.gz"),
+    ("per_debitur.zip", None, "zip"),
+    ("hasil.bin", None, "xlsx"),
+    ("hasil.bin", "parquet", "parquet"),
+])
+def test_output_format(output, fmt, expected):
+    assert output_format(output, fmt) == expected
+
+
+def _read_output(path, fmt):
+    if fmt == "xlsx":
+        return len(list(load_workbook(path, read_only=True).active.values)) - 1
+    if fmt == "parquet":
+        return len(pd.read_parquet(path))
+    if fmt == "csv.gz":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return len(pd.read_csv(f))
+    with zipfile.ZipFile(path) as zf:
+        return len(zf.namelist())
+
+
+@pytest.mark.parametrize("fmt, extension", [
+    ("xlsx", ".xlsx"), ("parquet", ".parquet"), ("csv.gz", ".csv.gz"), ("zip", ".zip"),
+])
+def test_main_writes_each_format(pdf_dir, tmp_path, fmt, extension):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    output = tmp_path / "out" / f"hasil{extension}"
+    assert main([str(pdf_dir), str(output), "-r", "--no-cache", "-w", "1", "-q"]) == 0
+    assert _read_output(output, fmt) > 0
+    assert os.listdir(output.parent) == [output.name]
+
+
+def test_main_error_exits(tmp_path, pdf_dir):
+    kosong = tmp_path / "kosong"
+    kosong.mkdir()
+    assert main([str(kosong), str(tmp_path / "hasil.xlsx"), "-q"]) == 1
+    assert not (tmp_path / "hasil.xlsx").exists()
+    with pytest.raises(SystemExit) as error:
+        main([str(pdf_dir), str(tmp_path / "hasil.xls"), "--format", "xls"])
+    assert error.value.code == 2
+
+
+def test_write_output_is_atomic(tmp_path, monkeypatch):
+    output = tmp_path / "hasil.xlsx"
+    output.write_bytes(b"lama")
+
+    def gagal(df, path):
+        with open(path, "wb") as f:
+            f.write(b"setengah")
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(batch_convert, "save_to_excel_formatted", gagal)
+    with pytest.raises(OSError):
+        write_output(pd.DataFrame({"a": [1]}), str(output), "xlsx")
+    # File lama utuh dan file sementara dibersihkan
+    assert output.read_bytes() == b"lama"
+    assert os.listdir(tmp_path) == ["hasil.xlsx"]
+
+
+def test_cli_does_not_import_streamlit():
+    # Proses baru: modul lain di sesi test ini sudah mengimpor webapp (dan streamlit)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, batch_convert; sys.exit('streamlit' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
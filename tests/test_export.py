@@ -0,0 +1,47 @@
+import gzip
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from export import excel_bytes, export_bytes, partition_keys, partitioned_excel_zip_bytes
+from pipeline import build_combined_data, combine_and_clean_data, process_all_facility_data
+from sample_corpus import page_texts, sample_reports
+
+
+@pytest.fixture(scope="module")
+def final_data():
+    text_lists = [page_texts(report) for report in sample_reports()]
+    return combine_and_clean_data(*process_all_facility_data(build_combined_data(text_lists)))
+
+
+def test_excel_bytes(final_data):
+    data = excel_bytes(final_data)
+    assert isinstance(data, bytes)
+    ws = load_workbook(io.BytesIO(data), read_only=True).active
+    rows = list(ws.values)
+    assert list(rows[0]) == list(final_data.columns)
+    assert len(rows) == len(final_data) + 1
+
+
+def test_export_bytes_csv_gz(final_data):
+    data = export_bytes(final_data, "csv.gz")
+    hasil = pd.read_csv(io.StringIO(gzip.decompress(data).decode("utf-8")))
+    assert list(hasil.columns) == list(final_data.columns)
+    assert len(hasil) == len(final_data)
+
+
+def test_export_bytes_parquet(final_data):
+    pytest.importorskip("pyarrow")
+    hasil = pd.read_parquet(io.BytesIO(export_bytes(final_data, "parquet")))
+    assert list(hasil.columns) == list(final_data.columns)
+    assert len(hasil) == len(final_data)
+
+
+def test_partitioned_excel_zip_bytes(final_data):
+    with zipfile.ZipFile(io.BytesIO(partitioned_excel_zip_bytes(final_data))) as zf:
+        names = zf.namelist()
+    assert len(names) == partition_keys(final_data).nunique()
+    assert all(name.endswith(".xlsx") for name in names)
@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+import pytest
+
+from extraction import (
+    EXTRACTION_BACKENDS, MIN_SHARD_PAGES, PageTextCache, extract_page_texts, extract_pdfs, page_shards,
+)
+from pipeline import process_all_facility_data
+from sample_corpus import page_texts, sample_reports
+from webapp import check_backend_parity
+
+pytest.importorskip("pymupdf")
+
+
+def test_backends_extract_the_generated_text(sample_pdfs):
+    for pdf_path, report in zip(sample_pdfs, sample_reports()):
+        for backend in EXTRACTION_BACKENDS:
+            assert extract_page_texts(pdf_path, backend=backend) == page_texts(report)
+
+
+def test_backend_parity_on_sample_corpus(sample_pdfs):
+    hasil = check_backend_parity(sample_pdfs)
+    assert len(hasil) == len(sample_pdfs)
+    for _, baris in hasil.iterrows():
+        jumlah, total = baris["Halaman identik"].split("/")
+        assert jumlah == total
+        assert all(baris[nama] == "✅" for nama in ["Kredit", "LC", "Garansi", "Surat", "Fasilitas"])
+
+
+def test_parsed_rows_match_across_backends(sample_pdfs):
+    frames = {
+        backend: process_all_facility_data(
+            pd.DataFrame({0: [text for path in sample_pdfs for text in extract_page_texts(path, backend=backend)]})
+        )
+        for backend in EXTRACTION_BACKENDS
+    }
+    for a, b in zip(frames["pdfplumber"], frames["pymupdf"]):
+        pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True))
+    assert sum(len(frame) for frame in frames["pdfplumber"]) > 0
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_extract_pdfs_keeps_upload_order_and_reports_progress(sample_pdfs, max_workers):
+    # Urutan upload sengaja dibalik: hasil tetap mengikuti urutan pdf_paths, bukan urutan selesai
+    pdf_paths = sample_pdfs[::-1]
+    calls = []
+    results = extract_pdfs(pdf_paths, max_workers=max_workers, backend="pymupdf",
+                           progress_callback=lambda *args: calls.append(args))
+
+    assert results == [page_texts(report) for report in sample_reports()[::-1]]
+    # progress_callback(selesai, total, pdf_path): sekali per file, selesai naik 1..total
+    assert [selesai for selesai, _, _ in calls] == list(range(1, len(pdf_paths) + 1))
+    assert {total for _, total, _ in calls} == {len(pdf_paths)}
+    assert sorted(path for _, _, path in calls) == sorted(pdf_paths)
+
+
+@pytest.mark.parametrize("n_pages", [1, MIN_SHARD_PAGES - 1, MIN_SHARD_PAGES])
+def test_small_documents_are_not_sharded(n_pages):
+    assert page_shards(n_pages, max_workers=8) == [None]
+
+
+@pytest.mark.parametrize("n_pages,max_workers,min_shard_pages", [
+    (MIN_SHARD_PAGES + 1, 2, MIN_SHARD_PAGES),
+    (400, 4, MIN_SHARD_PAGES),
+    (11, 3, 2),
+])
+def test_page_shards_are_contiguous_and_ordered(n_pages, max_workers, min_shard_pages):
+    shards = page_shards(n_pages, max_workers, min_shard_pages)
+    assert len(shards) > 1
+    assert [page for shard in shards for page in shard] == list(range(1, n_pages + 1))
+    assert all(len(shard) >= min_shard_pages for shard in shards[:-1])
+
+
+def test_sharded_extraction_reassembles_pages_in_order(sample_pdfs):
+    # min_shard_pages=2 memaksa setiap laporan contoh (5-12 halaman) dipecah ke beberapa worker
+    assert all(len(page_shards(len(page_texts(report)), 3, 2)) > 1 for report in sample_reports())
+    results = extract_pdfs(sample_pdfs, max_workers=3, min_shard_pages=2, backend="pymupdf")
+    assert results == extract_pdfs(sample_pdfs, max_workers=1, backend="pymupdf")
+    assert results == [page_texts(report) for report in sample_reports()]
+
+
+def test_page_cache_hits_on_repeat_run(sample_pdfs, tmp_path):
+    cache = PageTextCache(cache_dir=str(tmp_path))
+    pertama = extract_pdfs(sample_pdfs, backend="pymupdf", cache=cache)
+    assert (cache.hits, cache.misses) == (0, len(sample_pdfs))
+
+    kedua = extract_pdfs(sample_pdfs, backend="pymupdf", cache=cache)
+    assert kedua == pertama == [page_texts(report) for report in sample_reports()]
+    assert (cache.hits, cache.misses) == (len(sample_pdfs), len(sample_pdfs))
+
+
+def test_page_cache_misses_when_options_change(sample_pdfs, tmp_path):
+    cache = PageTextCache(cache_dir=str(tmp_path))
+    extract_pdfs(sample_pdfs, backend="pymupdf", cache=cache)
+    keys = {
+        cache.key(sample_pdfs[0], backend=backend, drop_overlay=drop_overlay)
+        for backend in EXTRACTION_BACKENDS
+        for drop_overlay in (True, False)
+    }
+    assert len(keys) == 2 * len(EXTRACTION_BACKENDS)
+
+    # Backend atau drop_overlay lain tidak boleh memakai teks hasil opsi sebelumnya
+    for opsi in ({"backend": "pdfplumber"}, {"backend": "pymupdf", "drop_overlay": False}):
+        cache.hits = cache.misses = 0
+        extract_pdfs(sample_pdfs, cache=cache, **opsi)
+        assert (cache.hits, cache.misses) == (0, len(sample_pdfs))
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    cache = PageTextCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+    text_data = ["halaman 1", "halaman 2"]
+    for key in "abc":
+        cache.put(key, text_data)
+    size = os.path.getsize(cache._path("a"))
+    # mtime dibuat berurutan a < b < c, lalu a dipakai lagi sehingga b menjadi yang paling lama
+    for detik, key in enumerate("abc", start=1):
+        os.utime(cache._path(key), (detik * 1000, detik * 1000))
+    assert cache.get("a") == text_data
+
+    cache.max_bytes = 3 * size
+    cache.put("d", text_data)
+    assert sorted(os.listdir(tmp_path)) == ["a.json.gz", "c.json.gz", "d.json.gz"]
+
+    cache.max_bytes = size
+    cache.put("e", text_data)
+    assert os.listdir(tmp_path) == ["e.json.gz"]
@@ -0,0 +1,90 @@
+"""Output pemindai fasilitas (scan_facility_lines) pada korpus contoh dikunci ke snapshot.
+
+Snapshot dibuat ulang hanya jika perubahan hasil parsing memang disengaja:
+    PYTHONPATH=. python tests/test_facility_sections.py
+"""
+import json
+import os
+
+import pytest
+
+from sample_corpus import PAGE_MARKER, page_texts, sample_reports
+from pipeline import FACILITY_SECTIONS, LABEL_PATTERN, build_combined_data, process_all_facility_data
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "data", "facility_sections.json")
+
+
+def section_snapshot():
+    """Kolom, dtype dan nilai setiap frame per jenis fasilitas untuk sample_reports()"""
+    text_lists = [page_texts(report) for report in sample_reports()]
+    frames = process_all_facility_data(build_combined_data(text_lists))
+    return {
+        name: {
+            "dtypes": {col: str(dtype) for col, dtype in frame.dtypes.items()},
+            **json.loads(frame.reset_index(drop=True).to_json(orient="split", index=False)),
+        }
+        for name, frame in zip(FACILITY_SECTIONS, frames)
+    }
+
+
+def test_sections_match_snapshot():
+    with open(SNAPSHOT_PATH, encoding="utf-8") as f:
+        expected = json.load(f)
+    actual = section_snapshot()
+    assert list(actual) == list(expected)
+    for name in expected:
+        assert actual[name]["columns"] == expected[name]["columns"], name
+        assert actual[name]["dtypes"] == expected[name]["dtypes"], name
+        assert len(actual[name]["data"]) == len(expected[name]["data"]), name
+        for i, (row, expected_row) in enumerate(zip(actual[name]["data"], expected[name]["data"])):
+            assert row == expected_row, f"{name} baris {i}"
+
+
+
+@pytest.mark.parametrize("line, label", [
+    # Label harus di awal baris: label fasilitas di tengah baris label lain tidak dipakai
+    ("Kode Valuta USD Tanggal Kondisi 02 Februari 2024", "Kode Valuta"),
+    ("Sovereign Rate BBB Nilai Dalam Mata Uang Asal Rp 999,00", "Sovereign Rate"),
+    ("Valuta IDR Tunggakan Rp 100,00", "Valuta"),
+    ("Nilai Dalam Mata Uang Asal Rp 200,00 Kondisi Fasilitas Aktif", "Nilai Dalam Mata Uang Asal"),
+    ("Keterangan Valuta asing, Tanggal Mulai diubah", "Keterangan"),
+    ("Penjelasan Valuta IDR", None),
+])
+def test_label_is_anchored_at_line_start(line, label):
+    match = LABEL_PATTERN.match(line)
+    assert (match.group(1) if match else None) == label
+
+
+def test_surat_labels_do_not_bleed_into_fasilitas():
+    # Baris "Sovereign Rate ..." dan "Kode Valuta ..." memuat label fasilitas
+    # (Nilai Dalam Mata Uang Asal, Valuta) di tengah baris; dulu menimpa field fasilitas
+    page = "\n".join([
+        PAGE_MARKER,
+        "Pelapor Cabang Baki Debet",
+        "014 - PT Bank Central Asia Tbk KCU Sudirman Rp 1.000,00",
+        "No Rekening F1234 Kualitas 1 - Lancar",
+        "Jenis Fasilitas Fasilitas Lainnya Jumlah Hari Tunggakan 3",
+        "Tanggal Mulai 01 Januari 2020 Tanggal Macet -",
+        "Tanggal Jatuh Tempo 01 Januari 2025 Sebab Macet -",
+        "Valuta IDR Tunggakan Rp 100,00",
+        "Nilai Dalam Mata Uang Asal Rp 200,00 Kondisi Fasilitas Aktif",
+        "Sovereign Rate BBB Nilai Dalam Mata Uang Asal Rp 999,00",
+        "Kode Valuta USD Tanggal Kondisi 02 Februari 2024",
+        "Suku Bunga/Imbalan 5.5% Tanggal Kondisi 03 Maret 2024",
+        "Keterangan -",
+    ])
+    fasilitas = process_all_facility_data(build_combined_data([[page]]))[4]
+    assert len(fasilitas) == 1
+    row = fasilitas.iloc[0].map(lambda value: value.strip() if isinstance(value, str) else value)
+    assert row["Valuta"] == "IDR"
+    assert row["Tunggakan Pokok"] == "Rp 100,00"
+    assert row["Nilai Dalam Mata Uang Asal"] == "Rp 200,00"
+    assert row["Kondisi"] == "Fasilitas Aktif"
+    assert row["Tanggal Kondisi"] == "03 Maret 2024"
+
+
+if __name__ == "__main__":
+    with open(SNAPSHOT_PATH, "w", encoding="utf-8") as f:
+        json.dump(section_snapshot(), f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    print(SNAPSHOT_PATH)
@@ -0,0 +1,73 @@
+import pytest
+
+from extraction import EXTRACTION_BACKENDS, PAGE_MARKER, extract_page_texts
+from pipeline import build_combined_data, combine_and_clean_data, process_all_facility_data
+from sample_corpus import page_texts, sample_reports, write_pdf
+from webapp import check_overlay_filter
+
+pytest.importorskip("pymupdf")
+
+GREY = (0.5, 0.5, 0.5)
+
+
+@pytest.fixture(scope="module")
+def reports():
+    return sample_reports(3, seed=7)
+
+
+def _write(tmp_path, reports, **kwargs):
+    return [write_pdf(report, str(tmp_path / f"slik_{i}.pdf"), **kwargs) for i, report in enumerate(reports)]
+
+
+@pytest.mark.parametrize("backend", EXTRACTION_BACKENDS)
+def test_grey_page_marker_is_kept(tmp_path, reports, backend):
+    paths = _write(tmp_path, reports, marker_color=GREY)
+    for path, report in zip(paths, reports):
+        texts = extract_page_texts(path, backend=backend)
+        assert texts == extract_page_texts(path, backend=backend, drop_overlay=False)
+        assert texts == page_texts(report)
+
+    text_lists = [extract_page_texts(path, backend=backend) for path in paths]
+    final = combine_and_clean_data(*process_all_facility_data(build_combined_data(text_lists)))
+    assert final["Nama Group"].notna().all()
+    assert final["Nama Group"].nunique() > 1
+
+
+@pytest.mark.parametrize("backend", EXTRACTION_BACKENDS)
+@pytest.mark.parametrize("watermark", ["rotated", "diagonal"])
+def test_watermark_is_dropped(tmp_path, reports, backend, watermark):
+    for path, report in zip(_write(tmp_path, reports, marker_color=GREY, watermark=watermark), reports):
+        assert extract_page_texts(path, backend=backend) == page_texts(report)
+        assert extract_page_texts(path, backend=backend, drop_overlay=False) != page_texts(report)
+
+
+@pytest.mark.parametrize("backend", EXTRACTION_BACKENDS)
+def test_page_marker_survives_an_overlay_styled_header(tmp_path, reports, backend):
+    # Penanda halaman yang dicetak seperti watermark (besar, abu-abu) tetap terbaca
+    import pymupdf
+
+    path = str(tmp_path / "besar.pdf")
+    doc = pymupdf.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_text((30, 40), PAGE_MARKER, fontsize=24, color=(0.7, 0.7, 0.7))
+    for y, line in enumerate(reports[0][1], start=1):
+        page.insert_text((30, 60 + 11 * y), line, fontsize=8)
+    doc.save(path)
+
+    (text,) = extract_page_texts(path, backend=backend)
+    assert PAGE_MARKER in text
+
+
+def test_check_overlay_filter_reports_differences(tmp_path, reports):
+    (tmp_path / "bersih").mkdir()
+    (tmp_path / "wm").mkdir()
+    bersih = _write(tmp_path / "bersih", reports)
+    watermark = _write(tmp_path / "wm", reports, watermark="diagonal")
+
+    tabel = check_overlay_filter(bersih)
+    assert (tabel["Halaman berubah"].str.startswith("0/")).all()
+    assert (tabel[["Kredit", "LC", "Garansi", "Surat", "Fasilitas"]] == "✅").all().all()
+
+    tabel = check_overlay_filter(watermark)
+    assert len(tabel) == len(reports)
+    assert not (tabel["Halaman berubah"].str.startswith("0/")).any()
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from cleaning import STRING_STORAGES
+from sample_corpus import page_texts, sample_reports
+from pipeline import build_combined_data, combine_and_clean_data, process_all_facility_data
+
+pytest.importorskip("polars")
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def text_lists():
+    """Korpus teks tetap: 6 laporan dengan semua jenis fasilitas dan suku bunga seperti 17.87%"""
+    return [page_texts(report) for report in sample_reports(6, seed=3)]
+
+
+@pytest.mark.parametrize("string_storage", STRING_STORAGES)
+@pytest.mark.parametrize("compact", [False, True])
+def test_polars_engine_matches_pandas(text_lists, compact, string_storage):
+    frames = process_all_facility_data(build_combined_data(text_lists, string_storage))
+    hasil = {
+        engine: combine_and_clean_data(*(frame.copy() for frame in frames), compact=compact,
+                                       string_storage=string_storage, engine=engine)
+        for engine in ("pandas", "polars")
+    }
+    assert len(hasil["pandas"]) > 0
+    # Persis sama, termasuk pembagian suku bunga (0.1787, bukan 0.17870000000000003)
+    pd.testing.assert_frame_equal(hasil["pandas"], hasil["polars"], check_exact=True)
+    rate = hasil["polars"]["Suku Bunga/Imbalan"].astype(float)
+    assert (rate == 0.1787).any() and not (rate == 17.87 * 0.01).any()
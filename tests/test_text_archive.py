@@ -0,0 +1,66 @@
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from text_archive import append_report, index_path, list_reports, load_combined_data, read_index, read_page
+
+
+def _pages(name, n):
+    return [f"{name} halaman {page}\nbaris kedua" for page in range(1, n + 1)]
+
+
+def test_roundtrip_and_duplicate_report(tmp_path):
+    archive = str(tmp_path / "arsip.jsonl.gz")
+    assert append_report(archive, "a.pdf", _pages("a", 3), "sha-a") == 3
+    assert append_report(archive, "b.pdf", _pages("b", 2), "sha-b") == 2
+    assert append_report(archive, "a-lagi.pdf", _pages("a", 3), "sha-a") == 0
+
+    assert read_page(archive, "b.pdf", 2) == "b halaman 2\nbaris kedua"
+    assert read_page(archive, "sha-a", 1) == "a halaman 1\nbaris kedua"
+    assert load_combined_data(archive)[0].tolist() == _pages("a", 3) + _pages("b", 2)
+    assert load_combined_data(archive, ["b.pdf"])[0].tolist() == _pages("b", 2)
+    assert list_reports(archive)["pages"].tolist() == [3, 2]
+    # Arsip tetap satu file gzip JSON lines yang sah
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["page"] for line in f] == [1, 2, 3, 1, 2]
+
+
+def test_interrupted_append_is_discarded(tmp_path):
+    archive = str(tmp_path / "arsip.jsonl.gz")
+    append_report(archive, "a.pdf", _pages("a", 2), "sha-a")
+
+    # Crash setelah data ditulis tetapi sebelum index lengkap: member yatim + baris index terpotong
+    orphan = gzip.compress(b'{"report": "x.pdf", "sha256": "sha-x", "page": 1, "text": "yatim"}\n')
+    with open(archive, "ab") as f:
+        f.write(orphan)
+    with open(index_path(archive), "a", encoding="utf-8") as f:
+        f.write('{"report": "x.pdf", "sha256": "sha-x", "pa')
+
+    assert load_combined_data(archive)[0].tolist() == _pages("a", 2)
+    assert [entry["sha256"] for entry in read_index(archive)] == ["sha-a", "sha-a"]
+
+    # Append berikutnya membuang sisa penulisan terputus, laporan yang sama bisa diarsipkan ulang
+    assert append_report(archive, "x.pdf", ["x halaman 1"], "sha-x") == 1
+    assert load_combined_data(archive)[0].tolist() == _pages("a", 2) + ["x halaman 1"]
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["text"] for line in f] == _pages("a", 2) + ["x halaman 1"]
+
+
+def _append(args):
+    archive, name = args
+    return append_report(archive, f"{name}.pdf", _pages(name, 5), f"sha-{name}")
+
+
+def test_concurrent_appends_from_processes(tmp_path):
+    archive = str(tmp_path / "arsip.jsonl.gz")
+    names = [f"r{i}" for i in range(12)]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        assert sum(executor.map(_append, [(archive, name) for name in names] * 2)) == 12 * 5
+
+    entries = read_index(archive)
+    assert len(entries) == 12 * 5
+    assert os.path.getsize(archive) == max(entry["offset"] + entry["length"] for entry in entries)
+    for name in names:
+        for page in (1, 5):
+            assert read_page(archive, f"{name}.pdf", page) == f"{name} halaman {page}\nbaris kedua"
@@ -0,0 +1,30 @@
+import io
+import os
+
+import pytest
+
+from webapp import uploaded_pdfs
+
+
+class _Upload(io.BytesIO):
+    """Pengganti UploadedFile Streamlit: nama file + getbuffer()"""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+
+def test_uploaded_pdfs_are_removed_after_the_block():
+    uploads = [_Upload("a.pdf", b"%PDF-a"), _Upload("b.pdf", b"%PDF-b")]
+    with uploaded_pdfs(uploads) as pdf_paths:
+        assert [os.path.basename(path) for path in pdf_paths] == ["a.pdf", "b.pdf"]
+        with open(pdf_paths[1], "rb") as f:
+            assert f.read() == b"%PDF-b"
+    assert not os.path.exists(os.path.dirname(pdf_paths[0]))
+
+
+def test_uploaded_pdfs_are_removed_when_processing_fails():
+    with pytest.raises(RuntimeError):
+        with uploaded_pdfs([_Upload("a.pdf", b"%PDF-a")]) as pdf_paths:
+            raise RuntimeError("ekstraksi gagal")
+    assert not os.path.exists(os.path.dirname(pdf_paths[0]))
@@ -0,0 +1,235 @@
+"""Arsip audit teks hasil ekstraksi laporan SLIK.
+
+Format arsip:
+- <arsip>.jsonl.gz: satu record JSON per halaman, setiap record dikompres
+  sebagai member gzip tersendiri. Gabungan member tetap file gzip yang sah,
+  jadi seluruh arsip bisa dibaca sebagai JSON lines biasa
+  (mis. ``gzip.open(path, "rt")``).
+- <arsip>.jsonl.gz.idx: index JSON lines berisi report, sha256, page, offset
+  dan length dari setiap record, sehingga satu halaman bisa dibaca langsung
+  (seek + dekompres satu member) tanpa membuka seluruh arsip.
+- <arsip>.jsonl.gz.lock: file kunci; penulis (web app, batch_convert) memegang
+  kunci OS selama append. Hanya data yang tercatat di index yang dianggap ada;
+  sisa penulisan yang terputus dibuang pada append berikutnya.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+
+
+def file_sha256(path):
+    """Menghitung sha256 isi file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_path(archive_path):
+    return archive_path + ".idx"
+
+
+def lock_path(archive_path):
+    return archive_path + ".lock"
+
+
+@contextmanager
+def _archive_lock(archive_path):
+    """Kunci eksklusif OS untuk menulis arsip.
+
+    Web app (thread per sesi) dan batch_convert dari cron bisa menulis ke arsip
+    yang sama; flock/msvcrt berlaku antar proses maupun antar thread karena
+    setiap pemanggilan membuka file kunci sendiri.
+    """
+    with open(lock_path(archive_path), "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK menyerah setelah ~10 detik; terus menunggu
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _ArchiveIndex:
+    """Index arsip di memori: entri urut penulisan dan peta sha256/nama laporan -> entri.
+
+    refresh hanya membaca baris index yang ditambahkan sejak pemanggilan
+    sebelumnya, jadi lookup per laporan/halaman tidak membaca ulang seluruh index.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.by_sha256 = {}
+        self.by_report = {}
+        # Byte index yang sudah dibaca (sampai baris lengkap terakhir) dan identitas file-nya
+        self.position = 0
+        self.file_id = None
+        # Akhir member terakhir yang tercatat; data setelahnya belum ter-commit
+        self.end = 0
+
+    def _add(self, entry):
+        self.entries.append(entry)
+        if entry["sha256"] not in self.by_sha256:
+            self.by_sha256[entry["sha256"]] = []
+            self.by_report.setdefault(entry["report"], []).append(entry["sha256"])
+        self.by_sha256[entry["sha256"]].append(entry)
+        self.end = max(self.end, entry["offset"] + entry["length"])
+
+    def refresh(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.__init__()
+            return self
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.position:
+            # Index baru, diganti atau dipotong: baca ulang dari awal
+            self.__init__()
+            self.file_id = file_id
+        if stat.st_size == self.position:
+            return self
+
+        with open(path, "rb") as f:
+            f.seek(self.position)
+            data = f.read()
+        # Baris terakhir tanpa newline (penulisan terputus) belum dianggap ada
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._add(json.loads(line))
+        self.position += complete
+        return self
+
+    def find(self, report):
+        """Entri satu laporan; report berupa sha256 atau nama file (versi terakhir jika diarsipkan berkali-kali)"""
+        if report in self.by_sha256:
+            return self.by_sha256[report]
+        versions = self.by_report.get(report)
+        return self.by_sha256[versions[-1]] if versions else []
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _load_index(archive_path):
+    """_ArchiveIndex arsip ini (dipakai bersama dalam satu proses), diperbarui dari file index"""
+    path = os.path.abspath(index_path(archive_path))
+    with _indexes_lock:
+        return _indexes.setdefault(path, _ArchiveIndex()).refresh(path)
+
+
+def read_index(archive_path):
+    """Seluruh index arsip sebagai list dict (urut sesuai penulisan)"""
+    return list(_load_index(archive_path).entries)
+
+
+def _discard_uncommitted(archive_path, index):
+    """Membuang sisa penulisan yang terputus (crash): baris index tidak lengkap dan data tanpa index"""
+    if os.path.exists(index_path(archive_path)) and os.path.getsize(index_path(archive_path)) > index.position:
+        with open(index_path(archive_path), "r+b") as index_file:
+            index_file.truncate(index.position)
+    if os.path.exists(archive_path) and os.path.getsize(archive_path) > index.end:
+        with open(archive_path, "r+b") as data_file:
+            data_file.truncate(index.end)
+
+
+def append_report(archive_path, report_name, text_data, sha256):
+    """Menambahkan teks semua halaman satu laporan ke arsip.
+
+    Laporan dengan sha256 yang sudah ada di arsip tidak ditulis ulang.
+    Mengembalikan jumlah halaman yang ditambahkan.
+    """
+    with _archive_lock(archive_path):
+        index = _load_index(archive_path)
+        if sha256 in index.by_sha256:
+            return 0
+        _discard_uncommitted(archive_path, index)
+
+        entries = []
+        offset = index.end
+        with open(archive_path, "ab") as data_file:
+            for page, text in enumerate(text_data, 1):
+                record = {"report": report_name, "sha256": sha256, "page": page, "text": text}
+                member = gzip.compress((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                data_file.write(member)
+                entries.append({"report": report_name, "sha256": sha256, "page": page,
+                                "offset": offset, "length": len(member)})
+                offset += len(member)
+            data_file.flush()
+            os.fsync(data_file.fileno())
+
+        # Index ditulis setelah data tersimpan supaya index tidak pernah menunjuk ke data yang belum ada
+        with open(index_path(archive_path), "a", encoding="utf-8") as index_file:
+            index_file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+
+    return len(entries)
+
+
+def list_reports(archive_path):
+    """Ringkasan laporan di arsip: satu baris per laporan beserta jumlah halamannya"""
+    index = pd.DataFrame(read_index(archive_path), columns=["report", "sha256", "page", "offset", "length"])
+    return (
+        index.groupby(["sha256", "report"], sort=False)["page"].count()
+        .rename("pages").reset_index()
+    )
+
+
+def _read_member(data_file, entry):
+    data_file.seek(entry["offset"])
+    return json.loads(gzip.decompress(data_file.read(entry["length"])))
+
+
+def read_page(archive_path, report, page):
+    """Membaca teks satu halaman (mulai dari 1) dari satu laporan tanpa membuka seluruh arsip"""
+    for entry in _load_index(archive_path).find(report):
+        if entry["page"] == page:
+            with open(archive_path, "rb") as data_file:
+                return _read_member(data_file, entry)["text"]
+    raise KeyError(f"Halaman {page} dari laporan {report} tidak ada di arsip")
+
+
+def load_combined_data(archive_path, reports=None):
+    """Memuat teks halaman dari arsip sebagai combined_data (kolom 0, satu halaman per baris).
+
+    reports (opsional) berisi sha256 atau nama laporan; None = seluruh arsip.
+    """
+    index = _load_index(archive_path)
+    if reports is None:
+        # Lewat index juga: data yang tidak tercatat di index (penulisan terputus) tidak ikut
+        entries = list(index.entries)
+    else:
+        entries = [entry for report in reports for entry in index.find(report)]
+
+    pages = []
+    if entries:
+        with open(archive_path, "rb") as data_file:
+            pages = [_read_member(data_file, entry)["text"] for entry in entries]
+
+    if not pages:
+        return None
+    return pd.DataFrame({0: pages})